@@ -8,22 +8,31 @@ This module contains all 7 critical fixes for the NITS document analysis system:
 1. Binary output detection and filtering
 2. Dossier loading validation
 3. Safe context extraction with bounds checking
-4. TF-IDF vectorizer caching for performance
+4. Keyword vectorizer caching for performance
 5. Fuzzy matching with negation detection
 6. Thread-safe batch processing
 7. API rate limiting with exponential backoff
 """
 
+import functools
+import io
 import json
+import os
 import re
 import time
 import logging
+import mmap
 import threading
+import weakref
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass, field
 
-# Third-party imports (install with: pip install PyMuPDF pandas scikit-learn fuzzywuzzy python-Levenshtein nltk)
+# Third-party imports (install with: pip install PyMuPDF pandas scikit-learn rapidfuzz nltk)
 try:
     import fitz  # PyMuPDF
     PYMUPDF_AVAILABLE = True
@@ -32,20 +41,71 @@ except ImportError:
     print("⚠️  Warning: PyMuPDF not installed. PDF processing will be limited.")
 
 try:
-    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.feature_extraction.text import HashingVectorizer
     from sklearn.metrics.pairwise import cosine_similarity
     import pandas as pd
     SKLEARN_AVAILABLE = True
 except ImportError:
     SKLEARN_AVAILABLE = False
-    print("⚠️  Warning: scikit-learn not installed. TF-IDF analysis will be disabled.")
+    print("⚠️  Warning: scikit-learn not installed. Keyword vectorization will be disabled.")
 
 try:
-    from fuzzywuzzy import fuzz
-    FUZZYWUZZY_AVAILABLE = True
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    FUZZYWUZZY_AVAILABLE = False
-    print("⚠️  Warning: fuzzywuzzy not installed. Fuzzy matching will be disabled.")
+    ORJSON_AVAILABLE = False
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    from rapidfuzz import fuzz, process
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+    print("⚠️  Warning: rapidfuzz not installed. Fuzzy matching will be disabled.")
+
+# Negation words that suppress a keyword match within 3 words of it
+NEGATION_WORDS = frozenset(['no', 'not', 'never', 'without', 'lack', 'absence', 'neither', 'nor'])
+
+# Finds every negation word in a document in a single regex scan
+NEGATION_PATTERN = re.compile(
+    r'\b(?:' + '|'.join(sorted(NEGATION_WORDS)) + r')\b',
+    re.IGNORECASE
+)
+
+# _split_words output: (words, lowercased words, word start offsets,
+# sorted indices of words that contain a negation)
+Tokens = tuple[List[str], List[str], List[int], List[int]]
+
+# Keywords up to this length skip the fuzzy pass once they have an exact hit,
+# since fuzzy matching short keywords produces mostly noise; longer ones are
+# still fuzzy matched on the words their exact hits do not cover
+SHORT_KEYWORD_LENGTH = 6
+
+# Fuzzy keyword x word scores are computed this many words at a time, so
+# the score matrix stays at (keywords x chunk) bytes whatever the text size
+FUZZY_CHUNK_WORDS = 4096
+
+# PDF extraction aborts once more than this fraction of pages are binary
+# (checked only after BINARY_ABORT_MIN_PAGES pages have been read)
+BINARY_ABORT_RATIO = 0.5
+BINARY_ABORT_MIN_PAGES = 3
+
+# Text and JSON files at least this large are read straight from a memory map
+MMAP_MIN_BYTES = 1 << 20
+
+# File types picked up by batch_process_documents
+DOCUMENT_SUFFIXES = ('.txt', '.pdf')
 
 # Configure logging
 logging.basicConfig(
@@ -55,6 +115,48 @@ logging.basicConfig(
 logger = logging.getLogger('NITS.CriticalFixes')
 
 
+def _whole_word(keyword: str) -> str:
+    """
+    Regex for a literal keyword that is not part of a longer word
+    Lookarounds rather than \\b, so keywords that start or end with
+    punctuation are anchored the same way
+    """
+    return rf'(?<!\w){re.escape(keyword)}(?!\w)'
+
+
+def _is_whole_word(text: str, start: int, end: int) -> bool:
+    """True when text[start:end] has no word character on either side (as _whole_word)"""
+    before = text[start - 1] if start > 0 else ' '
+    after = text[end] if end < len(text) else ' '
+    return not (before.isalnum() or before == '_' or after.isalnum() or after == '_')
+
+
+def _read_json(path: Path) -> Any:
+    """
+    Load a JSON file, using orjson when available
+    Large files (e.g. a multi-MB dossier) are parsed straight from a memory
+    map rather than first being copied into a bytes object
+    """
+    if ORJSON_AVAILABLE:
+        if path.stat().st_size < MMAP_MIN_BYTES:
+            return orjson.loads(path.read_bytes())
+        with open(path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    return orjson.loads(view)
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_json(path: Path, payload: Any):
+    """Write an indented JSON file, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        path.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=2)
+
+
 @dataclass
 class Violation:
     """Represents a detected violation"""
@@ -69,6 +171,82 @@ class Violation:
     trigger_logic: str = ""
 
 
+class ViolationBuffer:
+    """
+    Column-wise (SoA) storage for the violations found in one document
+    
+    Numeric fields live in flat typed arrays and string fields in parallel
+    lists, so the match loop allocates no per-hit objects and the threat
+    score is one vectorized reduction. The buffer stays inside the match
+    loop; AnalysisResult gets the to_violations() list.
+    """
+    
+    def __init__(self):
+        self.positions = array('q')
+        self.severities = array('d')
+        self.confidences = array('d')
+        self.categories: List[str] = []
+        self.regulations: List[str] = []
+        self.contexts: List[str] = []
+        self.keywords: List[str] = []
+        self.matched_texts: List[str] = []
+    
+    def append(
+        self,
+        category: str,
+        regulation: str,
+        severity: float,
+        confidence: float,
+        context: str,
+        position: int,
+        keyword: str,
+        matched_text: str
+    ):
+        """Record one violation"""
+        self.positions.append(position)
+        self.severities.append(severity)
+        self.confidences.append(confidence)
+        self.categories.append(category)
+        self.regulations.append(regulation)
+        self.contexts.append(context)
+        self.keywords.append(keyword)
+        self.matched_texts.append(matched_text)
+    
+    def mean_weighted_severity(self) -> float:
+        """Mean of severity * confidence over all violations"""
+        if not self.positions:
+            return 0.0
+        if NUMPY_AVAILABLE:
+            severities = np.frombuffer(self.severities, dtype=np.float64)
+            confidences = np.frombuffer(self.confidences, dtype=np.float64)
+            return float(np.dot(severities, confidences) / len(severities))
+        return sum(s * c for s, c in zip(self.severities, self.confidences)) / len(self)
+    
+    def _violation(self, i: int) -> Violation:
+        keyword = self.keywords[i]
+        matched_text = self.matched_texts[i]
+        score = self.confidences[i] * 100
+        severity = self.severities[i]
+        return Violation(
+            category=self.categories[i],
+            regulation=self.regulations[i],
+            severity=int(severity) if severity.is_integer() else severity,
+            confidence=self.confidences[i],
+            context=self.contexts[i],
+            location={'position': self.positions[i]},
+            keywords=[keyword],
+            extracted_text=matched_text,
+            trigger_logic=f"Fuzzy match: {keyword} -> {matched_text} (score: {score:g})"
+        )
+    
+    def __len__(self) -> int:
+        return len(self.positions)
+    
+    def to_violations(self) -> List[Violation]:
+        """Materialize every violation as a Violation dataclass"""
+        return [self._violation(i) for i in range(len(self))]
+
+
 @dataclass
 class AnalysisResult:
     """Result of document analysis"""
@@ -80,6 +258,24 @@ class AnalysisResult:
     processing_time: float = 0.0
 
 
+_FILE_LOCKS: "weakref.WeakValueDictionary[str, threading.Lock]" = weakref.WeakValueDictionary()
+_FILE_LOCKS_GUARD = threading.Lock()
+
+
+def _lock_for(path: str) -> threading.Lock:
+    """
+    FIX #6: One lock per file path
+    Looked up and created under a guard, so concurrent callers always share
+    one lock; an entry disappears only once nobody references its lock, so
+    a lock that is held (or handed out) is never replaced
+    """
+    with _FILE_LOCKS_GUARD:
+        lock = _FILE_LOCKS.get(path)
+        if lock is None:
+            lock = _FILE_LOCKS[path] = threading.Lock()
+        return lock
+
+
 class RateLimiter:
     """
     FIX #7: API Rate Limiting with exponential backoff
@@ -88,7 +284,7 @@ class RateLimiter:
     
     def __init__(self, max_requests_per_minute: int = 60):
         self.max_requests = max_requests_per_minute
-        self.requests = []
+        self.requests = deque()
         self.lock = threading.Lock()
         self.backoff_time = 1.0
         
@@ -96,12 +292,13 @@ class RateLimiter:
         """Wait if rate limit would be exceeded"""
         with self.lock:
             now = time.time()
-            # Remove requests older than 1 minute
-            self.requests = [req_time for req_time in self.requests if now - req_time < 60]
+            # Remove requests older than 1 minute (timestamps are appended in order)
+            while self.requests and now - self.requests[0] >= 60:
+                self.requests.popleft()
             
             if len(self.requests) >= self.max_requests:
                 # Calculate wait time with exponential backoff
-                oldest_request = min(self.requests)
+                oldest_request = self.requests[0]
                 wait_time = 60 - (now - oldest_request)
                 wait_time = max(wait_time, self.backoff_time)
                 
@@ -130,17 +327,38 @@ class FixedNITSAnalyzer:
         FIX #2: Enhanced dossier validation
         """
         self.dossier_path = dossier_path
-        self.dossier = self._load_master_dossier()
+        self._initialize(self._load_master_dossier())
+    
+    @classmethod
+    def from_dossier(cls, dossier: List[Dict[str, Any]]) -> "FixedNITSAnalyzer":
+        """
+        Build an analyzer from an already parsed dossier, skipping file I/O
+        The dossier goes through the same validation as a loaded file
+        """
+        analyzer = cls.__new__(cls)
+        analyzer.dossier_path = None
+        analyzer._initialize(cls._validate_dossier(dossier))
+        return analyzer
+    
+    def _initialize(self, dossier: List[Dict[str, Any]]):
+        """Precompute all per-dossier state from a validated dossier"""
+        self.dossier = dossier
+        self._flatten_keywords()
         self.vectorizer = None
         self.dossier_vectors = None
+        self.automaton = None
         self.rate_limiter = RateLimiter(max_requests_per_minute=60)
-        self.file_locks = {}
-        self.lock = threading.Lock()
+        # rapidfuzz threads per cdist call (-1: all cores; 1 inside pool workers)
+        self.fuzzy_workers = -1
         
-        # FIX #4: Pre-compute TF-IDF vectors for performance
+        # FIX #4: Pre-compute keyword vectors for performance
         if SKLEARN_AVAILABLE:
             self._precompute_vectors()
         
+        # Single-pass exact keyword scanner shared by every document
+        if AHOCORASICK_AVAILABLE:
+            self._build_matcher()
+        
     def _load_master_dossier(self) -> List[Dict[str, Any]]:
         """
         FIX #2: Load and validate master dossier with proper error handling
@@ -154,29 +372,7 @@ class FixedNITSAnalyzer:
                     f"   Please ensure the dossier file exists and path is correct."
                 )
             
-            with open(dossier_file, 'r', encoding='utf-8') as f:
-                dossier = json.load(f)
-            
-            # Validate dossier structure
-            if not isinstance(dossier, list):
-                raise ValueError(
-                    f"❌ Invalid dossier format: Expected list, got {type(dossier).__name__}"
-                )
-            
-            if len(dossier) == 0:
-                raise ValueError(
-                    f"❌ Empty dossier: The master dossier contains no entries"
-                )
-            
-            # Validate each entry has required fields
-            required_fields = ['category', 'keywords', 'regulation', 'severity']
-            for idx, entry in enumerate(dossier):
-                missing_fields = [field for field in required_fields if field not in entry]
-                if missing_fields:
-                    raise ValueError(
-                        f"❌ Dossier entry {idx} missing required fields: {missing_fields}\n"
-                        f"   Required fields: {required_fields}"
-                    )
+            dossier = self._validate_dossier(_read_json(dossier_file))
             
             logger.info(f"✅ Loaded and validated dossier: {len(dossier)} entries")
             return dossier
@@ -187,41 +383,165 @@ class FixedNITSAnalyzer:
                 f"   Please check the file syntax at {self.dossier_path}"
             )
     
+    @staticmethod
+    def _validate_dossier(dossier: Any) -> List[Dict[str, Any]]:
+        """
+        FIX #2: Validate dossier structure and required entry fields
+        """
+        if not isinstance(dossier, list):
+            raise ValueError(
+                f"❌ Invalid dossier format: Expected list, got {type(dossier).__name__}"
+            )
+        
+        if len(dossier) == 0:
+            raise ValueError(
+                f"❌ Empty dossier: The master dossier contains no entries"
+            )
+        
+        # Validate each entry has required fields
+        required_fields = ['category', 'keywords', 'regulation', 'severity']
+        for idx, entry in enumerate(dossier):
+            missing_fields = [field for field in required_fields if field not in entry]
+            if missing_fields:
+                raise ValueError(
+                    f"❌ Dossier entry {idx} missing required fields: {missing_fields}\n"
+                    f"   Required fields: {required_fields}"
+                )
+        
+        return dossier
+    
+    def _flatten_keywords(self):
+        """
+        Precompute (entry_idx, keyword, keyword_lower) for every dossier keyword,
+        plus the distinct lowercased keywords that are actually scanned
+        The dossier is immutable after init, so this is done once per analyzer
+        """
+        self._flat_keywords = []
+        for entry_idx, entry in enumerate(self.dossier):
+            keywords = entry.get('keywords', [])
+            if isinstance(keywords, str):
+                keywords = [keywords]
+            for keyword in keywords:
+                if keyword:
+                    self._flat_keywords.append((entry_idx, keyword, keyword.lower()))
+        
+        # Inverted index: each distinct keyword is scanned once per document
+        # and every hit is expanded into one violation per mapped entry
+        self._kw_to_entries: Dict[str, List[tuple[int, str]]] = defaultdict(list)
+        for entry_idx, keyword, keyword_lower in self._flat_keywords:
+            self._kw_to_entries[keyword_lower].append((entry_idx, keyword))
+        self._unique_keywords = list(self._kw_to_entries)
+        
+        # Entry fields each keyword expands into, resolved once so the
+        # per-document loop does no dossier dict lookups
+        self._keyword_targets = [
+            [
+                (
+                    self.dossier[entry_idx].get('category', 'Unknown'),
+                    self.dossier[entry_idx].get('regulation', 'Unknown'),
+                    self.dossier[entry_idx].get('severity', 50),
+                    keyword
+                )
+                for entry_idx, keyword in self._kw_to_entries[keyword_lower]
+            ]
+            for keyword_lower in self._unique_keywords
+        ]
+        
+        self._keyword_patterns = [
+            re.compile(_whole_word(keyword_lower), re.IGNORECASE)
+            for keyword_lower in self._unique_keywords
+        ]
+        
+        # One merged pattern used to skip the exact pass when nothing can match
+        self._keyword_union = None
+        if self._unique_keywords:
+            self._keyword_union = re.compile(
+                '|'.join(_whole_word(keyword_lower) for keyword_lower in self._unique_keywords),
+                re.IGNORECASE
+            )
+    
     def _precompute_vectors(self):
         """
-        FIX #4: Pre-compute TF-IDF vectors to avoid rebuilding on every document
-        This provides ~10x performance improvement
+        FIX #4: Pre-compute keyword vectors to avoid rebuilding on every document
+        HashingVectorizer needs no fit or vocabulary, so memory stays constant
         """
         if not SKLEARN_AVAILABLE:
             logger.warning("scikit-learn not available, skipping vectorization")
             return
         
-        logger.info("🔄 Pre-computing TF-IDF vectors...")
+        logger.info("🔄 Pre-computing keyword vectors...")
         
         # Extract all keywords from dossier
-        all_keywords = []
-        for entry in self.dossier:
-            keywords = entry.get('keywords', [])
-            if isinstance(keywords, list):
-                all_keywords.extend(keywords)
-            elif isinstance(keywords, str):
-                all_keywords.append(keywords)
+        all_keywords = [keyword for _, keyword, _ in self._flat_keywords]
         
         # Build and cache vectorizer
-        self.vectorizer = TfidfVectorizer(
-            max_features=1000,
+        self.vectorizer = HashingVectorizer(
+            n_features=2**14,
             stop_words='english',
-            ngram_range=(1, 3)
+            ngram_range=(1, 3),
+            alternate_sign=False
         )
         
-        # Fit vectorizer on keywords
         if all_keywords:
-            self.vectorizer.fit(all_keywords)
             self.dossier_vectors = self.vectorizer.transform(all_keywords)
             logger.info(f"✅ Vectorizer cached with {len(all_keywords)} keywords")
         else:
             logger.warning("No keywords found in dossier for vectorization")
     
+    def _build_matcher(self):
+        """
+        FIX #5: Build an Aho-Corasick automaton over all dossier keywords
+        Lets analyze_sec_document find every exact hit in one O(n) scan
+        """
+        self.automaton = ahocorasick.Automaton()
+        
+        for keyword_lower in self._unique_keywords:
+            self.automaton.add_word(keyword_lower, keyword_lower)
+        
+        if len(self.automaton) == 0:
+            self.automaton = None
+            return
+        
+        self.automaton.make_automaton()
+        logger.info(f"✅ Keyword automaton built with {len(self.automaton)} keywords")
+    
+    def _find_keyword_spans(self, text: str) -> List[List[tuple[int, int]]]:
+        """
+        FIX #5: Case-insensitive (start, end) spans of each dossier keyword
+        Returns one span list per entry of self._unique_keywords
+        
+        Only whole-word occurrences count, and a keyword's spans never
+        overlap each other (leftmost first, as re.finditer reports them),
+        whichever of the two scanners runs
+        """
+        if self._keyword_union is None or self._keyword_union.search(text) is None:
+            return [[] for _ in self._unique_keywords]
+        
+        text_lower = text.lower()
+        
+        # Lowercasing can change length for some Unicode characters, in which
+        # case automaton offsets would not map back onto the original text
+        if self.automaton is None or len(text_lower) != len(text):
+            return [
+                [m.span() for m in pattern.finditer(text)]
+                for pattern in self._keyword_patterns
+            ]
+        
+        hits = {}
+        for end_idx, keyword_lower in self.automaton.iter(text_lower):
+            start, end = end_idx - len(keyword_lower) + 1, end_idx + 1
+            if not _is_whole_word(text, start, end):
+                continue
+            
+            # Ends arrive in increasing order, so this keeps the leftmost
+            # non-overlapping spans
+            spans = hits.setdefault(keyword_lower, [])
+            if spans and start < spans[-1][1]:
+                continue
+            spans.append((start, end))
+        
+        return [hits.get(keyword_lower, []) for keyword_lower in self._unique_keywords]
+    
     def _contains_binary(self, text: str) -> bool:
         """
         FIX #1: Detect binary content in text
@@ -234,9 +554,19 @@ class FixedNITSAnalyzer:
             return True
         
         # Check for high proportion of non-printable characters
-        non_printable = sum(1 for c in text if ord(c) < 32 and c not in '\n\r\t')
-        if len(text) > 0 and non_printable / len(text) > 0.1:
-            return True
+        if NUMPY_AVAILABLE:
+            # Vectorized byte scan; control characters are single UTF-8 bytes
+            buf = np.frombuffer(text.encode('utf-8', 'ignore'), dtype=np.uint8)
+            control = buf < 32
+            non_printable = np.count_nonzero(
+                control & (buf != 9) & (buf != 10) & (buf != 13)
+            )
+            if buf.size > 0 and non_printable / buf.size > 0.1:
+                return True
+        else:
+            non_printable = sum(1 for c in text if ord(c) < 32 and c not in '\n\r\t')
+            if len(text) > 0 and non_printable / len(text) > 0.1:
+                return True
         
         # Check for PDF binary markers
         binary_markers = ['%PDF', 'endobj', 'endstream', '/Type /Catalog', 'xref']
@@ -254,22 +584,35 @@ class FixedNITSAnalyzer:
             return "ERROR: PyMuPDF not installed. Cannot extract PDF text.", "error"
         
         try:
-            doc = fitz.open(filepath)
-            text_parts = []
+            buffer = io.StringIO()
+            binary_pages = 0
             
-            for page_num, page in enumerate(doc):
-                page_text = page.get_text()
-                
-                # FIX #1: Validate each page for binary content
-                if self._contains_binary(page_text):
-                    logger.warning(f"Binary content detected on page {page_num + 1}")
-                    continue
+            with fitz.open(filepath) as doc:
+                # Plain text only; skip image block metadata
+                flags = fitz.TEXTFLAGS_TEXT & ~fitz.TEXT_PRESERVE_IMAGES
                 
-                text_parts.append(page_text)
-            
-            doc.close()
+                for page_num, page in enumerate(doc):
+                    page_text = page.get_text(flags=flags)
+                    
+                    # FIX #1: Validate each page for binary content
+                    if self._contains_binary(page_text):
+                        logger.warning(f"Binary content detected on page {page_num + 1}")
+                        binary_pages += 1
+                        pages_seen = page_num + 1
+                        if (pages_seen >= BINARY_ABORT_MIN_PAGES
+                                and binary_pages / pages_seen > BINARY_ABORT_RATIO):
+                            return (
+                                f"ERROR: PDF extraction aborted - {binary_pages} of "
+                                f"{pages_seen} pages contain binary content.",
+                                "binary"
+                            )
+                        continue
+                    
+                    if buffer.tell():
+                        buffer.write("\n")
+                    buffer.write(page_text)
             
-            full_text = "\n".join(text_parts)
+            full_text = buffer.getvalue()
             
             if not full_text.strip():
                 return (
@@ -313,13 +656,17 @@ class FixedNITSAnalyzer:
         self, 
         keyword: str, 
         text: str, 
-        threshold: int = 80
+        threshold: int = 80,
+        tokens: Optional[Tokens] = None
     ) -> List[Dict[str, Any]]:
         """
         FIX #5: Fuzzy matching with negation detection
         Prevents false positives like "no safety" matching "safety"
+        
+        `tokens` is the result of _split_words(text); pass it when matching
+        many keywords against the same text to tokenize only once
         """
-        if not FUZZYWUZZY_AVAILABLE:
+        if not RAPIDFUZZ_AVAILABLE:
             # Fallback to exact matching
             matches = []
             for match in re.finditer(re.escape(keyword), text, re.IGNORECASE):
@@ -330,40 +677,200 @@ class FixedNITSAnalyzer:
                 })
             return matches
         
-        matches = []
-        words = text.split()
+        words, words_lower, word_starts, negated = tokens or self._split_words(text)
+        
+        # Fast path: whole-word literal hits score 100 (as fuzz.ratio would)
+        # without any edit-distance work; their words are skipped below
+        spans = [m.span() for m in re.finditer(_whole_word(keyword), text, re.IGNORECASE)]
+        matches, covered = self._exact_keyword_matches(text, spans, word_starts, negated)
+        if covered and len(keyword) <= SHORT_KEYWORD_LENGTH:
+            return matches
+        
+        # Score every word in a single native call instead of a Python loop
+        candidates = process.extract(
+            keyword.lower(),
+            words_lower,
+            scorer=fuzz.ratio,
+            score_cutoff=threshold,
+            limit=None
+        )
         
-        # Negation words to check for
-        negations = ['no', 'not', 'never', 'without', 'lack', 'absence', 'neither', 'nor']
+        for _, score, i in sorted(candidates, key=lambda c: c[2]):
+            if i in covered:
+                continue
+            match = self._build_fuzzy_match(words, word_starts, negated, i, score)
+            if match is not None:
+                matches.append(match)
         
-        for i, word in enumerate(words):
-            # Calculate fuzzy match score
-            score = fuzz.ratio(keyword.lower(), word.lower())
+        return matches
+    
+    def _fuzzy_hits(
+        self,
+        keywords: List[str],
+        words_lower: List[str],
+        threshold: int = 80
+    ) -> List[tuple[int, int, float]]:
+        """
+        FIX #5: (keyword index, word index, score) for every pair scoring >= threshold
+        Candidates come from uint8 cdist calls over FUZZY_CHUNK_WORDS-word
+        chunks, so memory stays bounded; rounding can only add candidates,
+        and those few pairs are rescored exactly with fuzz.ratio
+        """
+        hits = []
+        for offset in range(0, len(words_lower), FUZZY_CHUNK_WORDS):
+            scores = process.cdist(
+                keywords,
+                words_lower[offset:offset + FUZZY_CHUNK_WORDS],
+                scorer=fuzz.ratio,
+                score_cutoff=threshold,
+                dtype=np.uint8,
+                workers=self.fuzzy_workers
+            )
             
-            if score >= threshold:
-                # Check for negation in surrounding context
-                # Look at 3 words before and after
-                context_start = max(0, i - 3)
-                context_end = min(len(words), i + 4)
-                context_words = words[context_start:context_end]
-                
-                # Check if any negation word appears near the match
-                has_negation = any(
-                    neg_word.lower() in [w.lower() for w in context_words]
-                    for neg_word in negations
+            rows, cols = np.nonzero(scores)
+            for row, col in zip(rows.tolist(), cols.tolist()):
+                i = offset + col
+                score = fuzz.ratio(keywords[row], words_lower[i])
+                if score >= threshold:
+                    hits.append((row, i, score))
+        
+        return hits
+    
+    def _batch_fuzzy_match(
+        self,
+        text: str,
+        threshold: int = 80,
+        tokens: Optional[Tokens] = None,
+        hits: Optional[List[tuple[int, int, float]]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        FIX #5: Score all dossier keywords against all words in native calls
+        Returns one match list per entry of self._unique_keywords
+        
+        `hits` may hold precomputed _fuzzy_hits over all unique keywords and
+        this document's words, as produced by analyze_sec_documents_batch
+        """
+        words, words_lower, word_starts, negated = tokens or self._split_words(text)
+        
+        # Fast path: literal hits score 100 without any edit-distance work;
+        # short keywords with an exact hit skip the fuzzy pass entirely
+        matches = []
+        covered = []
+        for spans in self._find_keyword_spans(text):
+            keyword_matches, keyword_covered = self._exact_keyword_matches(
+                text, spans, word_starts, negated
+            )
+            matches.append(keyword_matches)
+            covered.append(keyword_covered)
+        fuzzy_keys = [
+            k for k, keyword_lower in enumerate(self._unique_keywords)
+            if not covered[k] or len(keyword_lower) > SHORT_KEYWORD_LENGTH
+        ]
+        
+        if not fuzzy_keys or not words:
+            return matches
+        
+        if hits is None:
+            hits = [
+                (fuzzy_keys[row], i, score)
+                for row, i, score in self._fuzzy_hits(
+                    [self._unique_keywords[k] for k in fuzzy_keys], words_lower, threshold
                 )
-                
-                if not has_negation:
-                    # Find position in original text
-                    position = text.lower().find(word.lower())
-                    matches.append({
-                        'position': position,
-                        'matched_text': word,
-                        'score': score
-                    })
+            ]
+            fuzzy_set = None
+        else:
+            fuzzy_set = set(fuzzy_keys)
+        
+        # Negation filtering only runs on the surviving (keyword, word) pairs
+        for k, i, score in hits:
+            if fuzzy_set is not None and k not in fuzzy_set:
+                continue
+            if i in covered[k]:
+                continue
+            match = self._build_fuzzy_match(words, word_starts, negated, i, score)
+            if match is not None:
+                matches[k].append(match)
         
         return matches
     
+    def _split_words(self, text: str) -> Tokens:
+        """
+        Split text into words, tracking each word's offset in the original text
+        Returns: (words, lowercased words, word start offsets, negated word indices)
+        """
+        words = []
+        word_starts = []
+        for m in re.finditer(r'\S+', text):
+            words.append(m.group())
+            word_starts.append(m.start())
+        
+        # Map every negation hit back onto the index of the word containing it
+        negated = sorted({
+            bisect_right(word_starts, m.start()) - 1
+            for m in NEGATION_PATTERN.finditer(text)
+        })
+        
+        return words, [w.lower() for w in words], word_starts, negated
+    
+    def _exact_keyword_matches(
+        self,
+        text: str,
+        spans: List[tuple[int, int]],
+        word_starts: List[int],
+        negated: List[int]
+    ) -> tuple[List[Dict[str, Any]], set]:
+        """
+        FIX #5: Turn literal keyword spans into matches with negation detection
+        Returns: (matches, indices of the words covered by a span)
+        """
+        matches = []
+        covered = set()
+        
+        for start, end in spans:
+            first = bisect_right(word_starts, start) - 1
+            last = bisect_right(word_starts, end - 1) - 1
+            covered.update(range(first, last + 1))
+            
+            if self._is_negated(negated, first):
+                continue
+            
+            matches.append({
+                'position': start,
+                'matched_text': text[start:end],
+                'score': 100
+            })
+        
+        return matches, covered
+    
+    def _is_negated(self, negated: List[int], index: int) -> bool:
+        """
+        FIX #5: Check for a negation word within 3 words of word `index`
+        `negated` is the sorted negated-word index list from _split_words
+        """
+        # Look at 3 words before and after
+        i = bisect_left(negated, index - 3)
+        return i < len(negated) and negated[i] <= index + 3
+    
+    def _build_fuzzy_match(
+        self,
+        words: List[str],
+        word_starts: List[int],
+        negated: List[int],
+        index: int,
+        score: float
+    ) -> Optional[Dict[str, Any]]:
+        """
+        FIX #5: Build a match for words[index] unless it is negated
+        """
+        if self._is_negated(negated, index):
+            return None
+        
+        return {
+            'position': word_starts[index],
+            'matched_text': words[index],
+            'score': score
+        }
+    
     def analyze_sec_document(self, text: str, document_name: str) -> AnalysisResult:
         """
         Analyze SEC document with all fixes applied
@@ -372,54 +879,126 @@ class FixedNITSAnalyzer:
         
         # FIX #1: Validate input text for binary content
         if self._contains_binary(text):
-            logger.error(f"Binary content detected in {document_name}")
-            return AnalysisResult(
-                violations=[],
-                document_name=document_name,
-                extraction_method="binary_detected",
-                processing_time=time.time() - start_time
+            return self._binary_result(document_name, start_time)
+        
+        # Tokenize once per document and share it across all keywords
+        tokens = self._split_words(text)
+        
+        return self._analyze_tokens(text, document_name, tokens, start_time)
+    
+    def analyze_sec_documents_batch(
+        self,
+        texts: List[str],
+        document_names: List[str]
+    ) -> List[AnalysisResult]:
+        """
+        Analyze several documents, fuzzy-scoring all of their words against
+        the dossier keywords in one chunked pass (see _fuzzy_hits)
+        """
+        results: List[Optional[AnalysisResult]] = [None] * len(texts)
+        prepared = []
+        
+        for idx, (text, document_name) in enumerate(zip(texts, document_names)):
+            start_time = time.time()
+            
+            # FIX #1: Validate input text for binary content
+            if self._contains_binary(text):
+                results[idx] = self._binary_result(document_name, start_time)
+                continue
+            
+            prepared.append((idx, text, self._split_words(text), time.time() - start_time))
+        
+        # Fuzzy hits over all documents' words at once, split per document
+        doc_hits = None
+        shared_time = 0.0
+        all_words = [w for _, _, tokens, _ in prepared for w in tokens[1]]
+        if RAPIDFUZZ_AVAILABLE and NUMPY_AVAILABLE and all_words and self._unique_keywords:
+            start_time = time.time()
+            doc_starts = []
+            offset = 0
+            for _, _, tokens, _ in prepared:
+                doc_starts.append(offset)
+                offset += len(tokens[1])
+            
+            doc_hits = [[] for _ in prepared]
+            for k, i, score in self._fuzzy_hits(self._unique_keywords, all_words, 80):
+                d = bisect_right(doc_starts, i) - 1
+                doc_hits[d].append((k, i - doc_starts[d], score))
+            shared_time = (time.time() - start_time) / len(prepared)
+        
+        for n, (idx, text, tokens, prep_time) in enumerate(prepared):
+            start_time = time.time() - prep_time - shared_time
+            results[idx] = self._analyze_tokens(
+                text, document_names[idx], tokens, start_time,
+                hits=doc_hits[n] if doc_hits is not None else None
             )
         
-        violations = []
+        return results
+    
+    def _binary_result(self, document_name: str, start_time: float) -> AnalysisResult:
+        """FIX #1: Empty result for a document rejected as binary"""
+        logger.error(f"Binary content detected in {document_name}")
+        return AnalysisResult(
+            violations=[],
+            document_name=document_name,
+            extraction_method="binary_detected",
+            processing_time=time.time() - start_time
+        )
+    
+    def _analyze_tokens(
+        self,
+        text: str,
+        document_name: str,
+        tokens: Tokens,
+        start_time: float,
+        hits: Optional[List[tuple[int, int, float]]] = None
+    ) -> AnalysisResult:
+        """
+        Match the dossier against an already tokenized, non-binary document
+        `hits` optionally holds precomputed fuzzy hits for every keyword
+        """
+        violations = ViolationBuffer()
+        
+        # FIX #5: Use fuzzy matching with negation detection
+        if RAPIDFUZZ_AVAILABLE and NUMPY_AVAILABLE:
+            all_matches = self._batch_fuzzy_match(text, tokens=tokens, hits=hits)
+        else:
+            all_matches = [
+                self.fuzzy_match_with_negation_detection(keyword, text, tokens=tokens)
+                for keyword in self._unique_keywords
+            ]
         
-        # Analyze against each dossier entry
-        for entry in self.dossier:
-            keywords = entry.get('keywords', [])
-            if isinstance(keywords, str):
-                keywords = [keywords]
+        # Expand each distinct keyword's hits into its dossier entries
+        for targets, matches in zip(self._keyword_targets, all_matches):
+            if not matches:
+                continue
             
-            for keyword in keywords:
-                # FIX #5: Use fuzzy matching with negation detection
-                matches = self.fuzzy_match_with_negation_detection(keyword, text)
-                
+            for category, regulation, severity, keyword in targets:
                 for match in matches:
                     position = match['position']
                     
                     # FIX #3: Safe context extraction
                     context = self.extract_safe_context(text, position, context_size=150)
                     
-                    violation = Violation(
-                        category=entry.get('category', 'Unknown'),
-                        regulation=entry.get('regulation', 'Unknown'),
-                        severity=entry.get('severity', 50),
+                    violations.append(
+                        category=category,
+                        regulation=regulation,
+                        severity=severity,
                         confidence=match['score'] / 100.0,
                         context=context,
-                        location={'position': position},
-                        keywords=[keyword],
-                        extracted_text=match['matched_text'],
-                        trigger_logic=f"Fuzzy match: {keyword} -> {match['matched_text']} (score: {match['score']})"
+                        position=position,
+                        keyword=keyword,
+                        matched_text=match['matched_text']
                     )
-                    violations.append(violation)
         
-        # Calculate threat score
-        threat_score = 0.0
-        if violations:
-            threat_score = min(100.0, sum(v.severity * v.confidence for v in violations) / len(violations))
+        # Calculate threat score: mean confidence-weighted severity. Dossier
+        # severities are not range-checked, so keep the 100 cap on the result
+        threat_score = min(100.0, violations.mean_weighted_severity())
         
         processing_time = time.time() - start_time
         
         return AnalysisResult(
-            violations=violations,
+            violations=violations.to_violations(),
             document_name=document_name,
             total_violations=len(violations),
             threat_score=threat_score,
@@ -431,18 +1010,63 @@ class FixedNITSAnalyzer:
         """
         FIX #6: Thread-safe file locking to prevent race conditions
         """
-        with self.lock:
-            if filepath not in self.file_locks:
-                self.file_locks[filepath] = threading.Lock()
-            return self.file_locks[filepath]
+        return _lock_for(filepath)
+    
+    def _read_text_file(self, doc_file: Path) -> str:
+        """
+        Read a UTF-8 text file, decoding large files directly from a memory map
+        Avoids the intermediate bytes copy made by a buffered f.read()
+        """
+        if doc_file.stat().st_size < MMAP_MIN_BYTES:
+            with open(doc_file, 'r', encoding='utf-8') as f:
+                return f.read()
+        
+        with open(doc_file, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                text = str(mm, 'utf-8')
+        
+        # Match the universal-newline translation of text-mode reads
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        return text
+    
+    def _process_document(self, doc_file: Path, output: Path) -> AnalysisResult:
+        """
+        Extract, analyze and write the result file for a single document
+        """
+        logger.info(f"Processing: {doc_file.name}")
+        
+        # Extract text based on file type
+        if doc_file.suffix.lower() == '.pdf':
+            text, extraction_method = self._extract_pdf_text(str(doc_file))
+        else:
+            text = self._read_text_file(doc_file)
+            extraction_method = "text_file"
+        
+        # Analyze document
+        result = self.analyze_sec_document(text, doc_file.name)
+        result.extraction_method = extraction_method
+        
+        # FIX #6: Each document owns its output path, so workers never collide
+        output_file = output / f"{doc_file.stem}_analysis.json"
+        _write_json(output_file, {
+            'document': result.document_name,
+            'violations': len(result.violations),
+            'threat_score': result.threat_score,
+            'processing_time': result.processing_time
+        })
+        
+        return result
     
     def batch_process_documents(
         self, 
         folder_path: str, 
-        output_dir: str
+        output_dir: str,
+        max_workers: Optional[int] = None
     ) -> Dict[str, Any]:
         """
-        FIX #6: Thread-safe batch processing with file locking
+        FIX #6: Process-parallel batch processing
+        Each worker process loads the dossier once and handles whole documents
         """
         folder = Path(folder_path)
         output = Path(output_dir)
@@ -452,47 +1076,37 @@ class FixedNITSAnalyzer:
         total_processed = 0
         total_errors = 0
         
-        # Get all document files
-        document_files = list(folder.glob('*.txt')) + list(folder.glob('*.pdf'))
+        # Get all document files in one directory scan, smallest first so
+        # results start arriving while the large files are still queued
+        # (ties broken by name, so the submission order is deterministic)
+        document_files = [
+            path for _, path in sorted(_scan_documents(folder), key=lambda item: (item[0], item[1].name))
+        ]
         
-        for doc_file in document_files:
-            try:
+        with ProcessPoolExecutor(
+            max_workers=max_workers or os.cpu_count(),
+            initializer=_init_worker,
+            initargs=(self.dossier,)
+        ) as executor:
+            futures = {}
+            for doc_file in document_files:
                 # FIX #7: Apply rate limiting before processing
                 self.rate_limiter.wait_if_needed()
-                
-                logger.info(f"Processing: {doc_file.name}")
-                
-                # Extract text based on file type
-                if doc_file.suffix.lower() == '.pdf':
-                    text, extraction_method = self._extract_pdf_text(str(doc_file))
-                else:
-                    with open(doc_file, 'r', encoding='utf-8') as f:
-                        text = f.read()
-                    extraction_method = "text_file"
-                
-                # Analyze document
-                result = self.analyze_sec_document(text, doc_file.name)
-                result.extraction_method = extraction_method
-                results.append(result)
-                
-                # FIX #6: Thread-safe file writing
-                output_file = output / f"{doc_file.stem}_analysis.json"
-                file_lock = self._get_file_lock(str(output_file))
-                
-                with file_lock:
-                    with open(output_file, 'w', encoding='utf-8') as f:
-                        json.dump({
-                            'document': result.document_name,
-                            'violations': len(result.violations),
-                            'threat_score': result.threat_score,
-                            'processing_time': result.processing_time
-                        }, f, indent=2)
-                
-                total_processed += 1
-                
-            except Exception as e:
-                logger.error(f"Error processing {doc_file.name}: {str(e)}")
-                total_errors += 1
+                futures[executor.submit(_process_one, str(doc_file), str(output))] = doc_file
+            
+            # Collect in completion order so one slow document does not
+            # hold back results (and error reports) for the rest
+            for future in as_completed(futures):
+                doc_file = futures[future]
+                try:
+                    results.append(future.result())
+                    total_processed += 1
+                except Exception as e:
+                    logger.error(f"Error processing {doc_file.name}: {str(e)}")
+                    total_errors += 1
+        
+        # Completion order varies from run to run; report in a stable order
+        results.sort(key=lambda result: result.document_name)
         
         success_rate = (total_processed / len(document_files) * 100) if document_files else 0
         
@@ -504,11 +1118,48 @@ class FixedNITSAnalyzer:
         }
 
 
-def create_sample_dossier(output_path: str = "master_dossier.json"):
+def _scan_documents(folder: Path):
     """
-    Create a sample master dossier for testing
+    Yield (size, path) for every .txt/.pdf file directly inside folder
+    os.scandir returns the file type with the listing (and the size too on
+    Windows), and entry.stat() caches its result. Dotfiles are included,
+    as Path.glob('*.txt') includes them
     """
-    sample_dossier = [
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if not entry.name.endswith(DOCUMENT_SUFFIXES):
+                continue
+            if entry.is_file():
+                yield entry.stat().st_size, Path(entry.path)
+
+
+# Per-process analyzer used by batch_process_documents workers
+_worker_analyzer: Optional[FixedNITSAnalyzer] = None
+
+
+def _init_worker(dossier: List[Dict[str, Any]]):
+    """
+    ProcessPoolExecutor initializer: build the analyzer once per worker
+    from the parent's already parsed dossier
+    """
+    global _worker_analyzer
+    _worker_analyzer = FixedNITSAnalyzer.from_dossier(dossier)
+    # The pool already runs one worker per core; don't fan out again inside
+    _worker_analyzer.fuzzy_workers = 1
+
+
+def _process_one(doc_path: str, output_dir: str) -> AnalysisResult:
+    """
+    ProcessPoolExecutor task: analyze one document with the worker's analyzer
+    """
+    return _worker_analyzer._process_document(Path(doc_path), Path(output_dir))
+
+
+def build_sample_dossier() -> List[Dict[str, Any]]:
+    """
+    Build the sample master dossier used for testing
+    """
+    return [
         {
             "category": "Financial Fraud",
             "regulation": "SEC Rule 10b-5",
@@ -534,9 +1185,21 @@ def create_sample_dossier(output_path: str = "master_dossier.json"):
             "keywords": ["insider trading", "material non-public information", "tipping"]
         }
     ]
-    
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(sample_dossier, f, indent=2)
+
+
+@functools.lru_cache(maxsize=1)
+def _sample_dossier_bytes() -> bytes:
+    """
+    Serialized sample dossier, computed once per process
+    """
+    return json.dumps(build_sample_dossier(), indent=2).encode('utf-8')
+
+
+def create_sample_dossier(output_path: str = "master_dossier.json"):
+    """
+    Create a sample master dossier for testing
+    """
+    Path(output_path).write_bytes(_sample_dossier_bytes())
     
     logger.info(f"✅ Created sample dossier: {output_path}")
 
@@ -8,11 +8,20 @@ Comprehensive system diagnostics to validate all fixes and ensure production rea
 Tests all 7 critical fixes and provides a health score.
 """
 
+import bisect
+import contextlib
+import functools
+import importlib.util
+import io
 import json
+import os
 import time
 import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, List, Sequence, Tuple, Union
+from unittest import mock
 
 # Color codes for terminal output
 class Colors:
@@ -26,14 +35,20 @@ class Colors:
     BOLD = '\033[1m'
 
 
+# (name, test function) or (name, test function, required test names)
+TestSpec = Union[Tuple[str, Callable], Tuple[str, Callable, Sequence[str]]]
+
+
 class NITSDiagnostics:
     """System diagnostics runner"""
     
     def __init__(self):
         self.tests_passed = 0
         self.tests_failed = 0
+        self.tests_skipped = 0
         self.tests_total = 0
         self.results = []
+        self.passed = set()
         
     def print_header(self):
         """Print diagnostic header"""
@@ -42,93 +57,240 @@ class NITSDiagnostics:
         print(f"{Colors.HEADER}  Comprehensive System Health Check{Colors.ENDC}")
         print(f"{Colors.HEADER}{'=' * 70}{Colors.ENDC}\n")
     
-    def run_test(self, test_name: str, test_func) -> bool:
-        """Run a single test and record results"""
+    def run_test(self, test_name: str, test_func, required: Sequence[str] = ()) -> bool:
+        """Run a single test and record results (skipped if a prerequisite failed)"""
         self.tests_total += 1
-        print(f"\n{Colors.OKBLUE}🧪 Test {self.tests_total}: {test_name}{Colors.ENDC}")
+        with _buffered_stdout():
+            print(f"\n{Colors.OKBLUE}🧪 Test {self.tests_total}: {test_name}{Colors.ENDC}")
+            
+            unmet = self._unmet(required)
+            if unmet:
+                return self._record_skip(test_name, unmet)
+            
+            try:
+                success, message = test_func()
+            except Exception as e:
+                success, message = False, f"Exception: {str(e)}"
+            
+            return self._record_result(test_name, success, message)
+    
+    def run_tests(self, tests: List[TestSpec], max_workers: int = None) -> List[bool]:
+        """
+        Run tests in parallel worker processes, reporting results in test order
+        Tests without prerequisites are dispatched up front; tests with a
+        `required` list are dispatched once those (earlier) tests have
+        reported, and skipped if any of them did not pass
+        """
+        specs = [(spec[0], spec[1], tuple(spec[2]) if len(spec) > 2 else ()) for spec in tests]
         
-        try:
-            success, message = test_func()
+        with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+            futures = {
+                name: executor.submit(_run_isolated, func)
+                for name, func, required in specs if not required
+            }
             
-            if success:
-                self.tests_passed += 1
-                print(f"   {Colors.OKGREEN}✅ PASS{Colors.ENDC} - {message}")
-                self.results.append((test_name, True, message))
-                return True
-            else:
-                self.tests_failed += 1
-                print(f"   {Colors.FAIL}❌ FAIL{Colors.ENDC} - {message}")
-                self.results.append((test_name, False, message))
-                return False
+            outcomes = []
+            for test_name, _, required in specs:
+                if test_name not in futures:
+                    # First gated test: every prerequisite listed before it has
+                    # reported, so dispatch all remaining gated tests together
+                    futures.update(
+                        (name, executor.submit(_run_isolated, func))
+                        for name, func, req in specs
+                        if name not in futures and not self._unmet(req)
+                    )
                 
-        except Exception as e:
+                self.tests_total += 1
+                with _buffered_stdout():
+                    print(f"\n{Colors.OKBLUE}🧪 Test {self.tests_total}: {test_name}{Colors.ENDC}")
+                    
+                    future = futures.get(test_name)
+                    if future is None:
+                        outcomes.append(self._record_skip(test_name, self._unmet(required)))
+                        continue
+                    
+                    try:
+                        success, message = future.result()
+                    except Exception as e:
+                        success, message = False, f"Exception: {str(e)}"
+                    
+                    outcomes.append(self._record_result(test_name, success, message))
+        
+        return outcomes
+    
+    def _unmet(self, required: Sequence[str]) -> List[str]:
+        """Prerequisites that have not (yet) passed"""
+        return [name for name in required if name not in self.passed]
+    
+    def _record_result(self, test_name: str, success: bool, message: str) -> bool:
+        """Print and record the outcome of one test"""
+        if success:
+            self.tests_passed += 1
+            self.passed.add(test_name)
+            print(f"   {Colors.OKGREEN}✅ PASS{Colors.ENDC} - {message}")
+        else:
             self.tests_failed += 1
-            error_msg = f"Exception: {str(e)}"
-            print(f"   {Colors.FAIL}❌ FAIL{Colors.ENDC} - {error_msg}")
-            self.results.append((test_name, False, error_msg))
-            return False
+            print(f"   {Colors.FAIL}❌ FAIL{Colors.ENDC} - {message}")
+        
+        self.results.append((test_name, success, message))
+        return success
+    
+    def _record_skip(self, test_name: str, unmet: Sequence[str]) -> bool:
+        """Print and record a test skipped because a prerequisite failed"""
+        self.tests_skipped += 1
+        message = f"SKIPPED (prereq failed: {', '.join(unmet)})"
+        print(f"   {Colors.WARNING}⏭️  SKIP{Colors.ENDC} - {message}")
+        
+        self.results.append((test_name, False, message))
+        return False
     
     def print_summary(self):
         """Print test summary and health score"""
         score = (self.tests_passed / self.tests_total * 100) if self.tests_total > 0 else 0
         
-        print(f"\n{Colors.HEADER}{'=' * 70}{Colors.ENDC}")
-        print(f"{Colors.BOLD}DIAGNOSTIC SUMMARY{Colors.ENDC}\n")
-        print(f"Total Tests:  {self.tests_total}")
-        print(f"Passed:       {Colors.OKGREEN}{self.tests_passed}{Colors.ENDC}")
-        print(f"Failed:       {Colors.FAIL}{self.tests_failed}{Colors.ENDC}")
-        print(f"Score:        {self._get_score_color(score)}{score:.1f}%{Colors.ENDC}")
-        
-        # Health status
-        print(f"\n{Colors.BOLD}HEALTH STATUS:{Colors.ENDC}")
-        if score >= 90:
-            print(f"{Colors.OKGREEN}✅ EXCELLENT (90%+) - Ready to deploy{Colors.ENDC}")
-        elif score >= 75:
-            print(f"{Colors.WARNING}⚠️  GOOD (75-89%) - Deploy with monitoring{Colors.ENDC}")
-        elif score >= 50:
-            print(f"{Colors.WARNING}⚠️  FAIR (50-74%) - Address failures before deployment{Colors.ENDC}")
-        else:
-            print(f"{Colors.FAIL}❌ CRITICAL (<50%) - Fix failing tests first{Colors.ENDC}")
-        
-        print(f"{Colors.HEADER}{'=' * 70}{Colors.ENDC}\n")
-        
+        with _buffered_stdout():
+            print(f"\n{Colors.HEADER}{'=' * 70}{Colors.ENDC}")
+            print(f"{Colors.BOLD}DIAGNOSTIC SUMMARY{Colors.ENDC}\n")
+            print(f"Total Tests:  {self.tests_total}")
+            print(f"Passed:       {Colors.OKGREEN}{self.tests_passed}{Colors.ENDC}")
+            print(f"Failed:       {Colors.FAIL}{self.tests_failed}{Colors.ENDC}")
+            print(f"Skipped:      {Colors.WARNING}{self.tests_skipped}{Colors.ENDC}")
+            print(f"Score:        {self._get_score_color(score)}{score:.1f}%{Colors.ENDC}")
+            
+            # Health status
+            print(f"\n{Colors.BOLD}HEALTH STATUS:{Colors.ENDC}")
+            _, _, status_color, status = _score_row(score)
+            print(f"{status_color}{status}{Colors.ENDC}")
+            
+            print(f"{Colors.HEADER}{'=' * 70}{Colors.ENDC}\n")
+            
         return score
     
     def _get_score_color(self, score: float) -> str:
         """Get color code based on score"""
-        if score >= 90:
-            return Colors.OKGREEN
-        elif score >= 75:
-            return Colors.WARNING
-        else:
-            return Colors.FAIL
+        return _score_row(score)[1]
 
 
-# Test Functions
+# Health bands as (lower bound, score color, status color, status line),
+# ordered by bound so bisect on the bounds picks the row for a score
+_SCORE_TABLE = (
+    (float("-inf"), Colors.FAIL, Colors.FAIL, "❌ CRITICAL (<50%) - Fix failing tests first"),
+    (50, Colors.FAIL, Colors.WARNING, "⚠️  FAIR (50-74%) - Address failures before deployment"),
+    (75, Colors.WARNING, Colors.WARNING, "⚠️  GOOD (75-89%) - Deploy with monitoring"),
+    (90, Colors.OKGREEN, Colors.OKGREEN, "✅ EXCELLENT (90%+) - Ready to deploy"),
+)
+_SCORE_BOUNDS = [row[0] for row in _SCORE_TABLE]
 
-def test_dependencies() -> Tuple[bool, str]:
-    """Test 1: Check if required dependencies are installed"""
-    missing = []
-    
+
+def _score_row(score: float) -> Tuple[float, str, str, str]:
+    """Look up the health band row for a score"""
+    return _SCORE_TABLE[bisect.bisect_right(_SCORE_BOUNDS, score) - 1]
+
+
+# (import name, pip package) pairs checked by test_dependencies
+REQUIRED_PACKAGES = (
+    ("fitz", "PyMuPDF"),
+    ("sklearn", "scikit-learn"),
+    ("rapidfuzz", "rapidfuzz"),
+    ("pandas", "pandas"),
+)
+
+
+# Fields every sample dossier entry must carry
+REQUIRED_FIELDS = frozenset(("category", "keywords", "regulation", "severity"))
+
+
+@functools.lru_cache(maxsize=None)
+def _module_available(name: str) -> bool:
+    """
+    Memoized availability probe for an optional dependency
+    find_spec locates the module without executing its import graph
+    """
     try:
-        import fitz
-    except ImportError:
-        missing.append("PyMuPDF")
-    
+        return importlib.util.find_spec(name) is not None
+    except ValueError:
+        # find_spec raises on malformed names or modules with a None __spec__
+        return False
+
+
+@contextlib.contextmanager
+def _buffered_stdout():
+    """
+    Collect prints into memory and emit them as a single stdout write
+    Keeps each test's block to one syscall even when stdout is piped
+    """
+    buf = io.StringIO()
     try:
-        import sklearn
-    except ImportError:
-        missing.append("scikit-learn")
-    
+        with contextlib.redirect_stdout(buf):
+            yield
+    finally:
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
+
+
+def _tmp_json_path() -> str:
+    """Reserve a unique temporary .json path (the caller removes it)"""
+    fd, path = tempfile.mkstemp(prefix="nits_diag_", suffix=".json")
+    os.close(fd)
+    return path
+
+
+@contextlib.contextmanager
+def _auto_cleanup(*paths):
+    """Remove the given files on exit; unlink(missing_ok=True) skips the stat"""
     try:
-        import fuzzywuzzy
-    except ImportError:
-        missing.append("fuzzywuzzy")
+        yield
+    finally:
+        for path in paths:
+            Path(path).unlink(missing_ok=True)
+
+
+@contextlib.contextmanager
+def _tmp_dossier():
+    """Yield the path of a freshly written sample dossier, removed on exit"""
+    from critical_fixes import create_sample_dossier
     
-    try:
-        import pandas
-    except ImportError:
-        missing.append("pandas")
+    path = _tmp_json_path()
+    with _auto_cleanup(path):
+        create_sample_dossier(path)
+        yield path
+
+
+@functools.lru_cache(maxsize=1)
+def _shared_analyzer():
+    """
+    One FixedNITSAnalyzer per process, shared by the read-only tests
+    Built from the in-memory sample dossier, so no file is written or read
+    """
+    from critical_fixes import FixedNITSAnalyzer, build_sample_dossier
+    
+    return FixedNITSAnalyzer.from_dossier(build_sample_dossier())
+
+
+def _run_isolated(test_func) -> Tuple[bool, str]:
+    """
+    Worker entry point: run a test inside its own temporary working directory
+    so any files a test leaves behind cannot leak into the caller's cwd
+    """
+    original_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="nits_diag_") as workdir:
+        os.chdir(workdir)
+        try:
+            return test_func()
+        except Exception as e:
+            return False, f"Exception: {str(e)}"
+        finally:
+            os.chdir(original_cwd)
+
+
+# Test Functions
+
+def test_dependencies() -> Tuple[bool, str]:
+    """Test 1: Check if required dependencies are installed"""
+    missing = [
+        package for module, package in REQUIRED_PACKAGES
+        if not _module_available(module)
+    ]
     
     if missing:
         return False, f"Missing packages: {', '.join(missing)}"
@@ -148,30 +310,25 @@ def test_critical_fixes_import() -> Tuple[bool, str]:
 def test_sample_dossier_creation() -> Tuple[bool, str]:
     """Test 3: Create and validate sample dossier"""
     try:
-        from critical_fixes import create_sample_dossier
-        
-        test_path = "test_dossier.json"
-        create_sample_dossier(test_path)
-        
-        # Validate created file
-        if not Path(test_path).exists():
-            return False, "Dossier file was not created"
-        
-        with open(test_path, 'r') as f:
-            dossier = json.load(f)
+        with _tmp_dossier() as test_path:
+            # Validate created file
+            if not Path(test_path).exists():
+                return False, "Dossier file was not created"
+            
+            with open(test_path, 'r') as f:
+                dossier = json.load(f)
         
         if not isinstance(dossier, list) or len(dossier) == 0:
             return False, "Invalid dossier format"
         
         # Check required fields
-        required_fields = ['category', 'keywords', 'regulation', 'severity']
-        for entry in dossier:
-            for field in required_fields:
-                if field not in entry:
-                    return False, f"Missing required field: {field}"
-        
-        # Cleanup
-        Path(test_path).unlink()
+        missing = next(
+            (REQUIRED_FIELDS - entry.keys() for entry in dossier
+             if not REQUIRED_FIELDS.issubset(entry)),
+            None
+        )
+        if missing:
+            return False, f"Missing required field: {min(missing)}"
         
         return True, f"Created and validated dossier with {len(dossier)} entries"
         
@@ -182,38 +339,25 @@ def test_sample_dossier_creation() -> Tuple[bool, str]:
 def test_binary_detection() -> Tuple[bool, str]:
     """Test 4 (FIX #1): Binary content detection"""
     try:
-        from critical_fixes import FixedNITSAnalyzer, create_sample_dossier
-        
-        # Create temp dossier
-        test_dossier = "test_dossier.json"
-        create_sample_dossier(test_dossier)
-        
-        analyzer = FixedNITSAnalyzer(test_dossier)
+        analyzer = _shared_analyzer()
         
         # Test with binary content
         binary_text = "Valid text \x00 with null byte"
         has_binary = analyzer._contains_binary(binary_text)
         
         if not has_binary:
-            Path(test_dossier).unlink()
             return False, "Failed to detect binary content"
         
         # Test with clean text
         clean_text = "This is normal readable text with no binary content"
         has_binary = analyzer._contains_binary(clean_text)
         
-        # Cleanup
-        Path(test_dossier).unlink()
-        
         if has_binary:
             return False, "False positive: Clean text flagged as binary"
         
         return True, "Binary detection working correctly"
         
     except Exception as e:
-        # Cleanup on error
-        if Path("test_dossier.json").exists():
-            Path("test_dossier.json").unlink()
         return False, f"Error: {str(e)}"
 
 
@@ -229,35 +373,29 @@ def test_dossier_validation() -> Tuple[bool, str]:
         except FileNotFoundError:
             pass  # Expected
         
-        # Test 2: Invalid JSON
-        invalid_json_path = "invalid_dossier.json"
-        with open(invalid_json_path, 'w') as f:
-            f.write("{ invalid json ]")
-        
-        try:
-            analyzer = FixedNITSAnalyzer(invalid_json_path)
-            Path(invalid_json_path).unlink()
-            return False, "Should have raised ValueError for invalid JSON"
-        except ValueError:
-            pass  # Expected
-        finally:
-            if Path(invalid_json_path).exists():
-                Path(invalid_json_path).unlink()
-        
-        # Test 3: Empty dossier
-        empty_dossier_path = "empty_dossier.json"
-        with open(empty_dossier_path, 'w') as f:
-            json.dump([], f)
+        invalid_json_path = _tmp_json_path()
+        empty_dossier_path = _tmp_json_path()
         
-        try:
-            analyzer = FixedNITSAnalyzer(empty_dossier_path)
-            Path(empty_dossier_path).unlink()
-            return False, "Should have raised ValueError for empty dossier"
-        except ValueError:
-            pass  # Expected
-        finally:
-            if Path(empty_dossier_path).exists():
-                Path(empty_dossier_path).unlink()
+        with _auto_cleanup(invalid_json_path, empty_dossier_path):
+            # Test 2: Invalid JSON
+            with open(invalid_json_path, 'w') as f:
+                f.write("{ invalid json ]")
+            
+            try:
+                analyzer = FixedNITSAnalyzer(invalid_json_path)
+                return False, "Should have raised ValueError for invalid JSON"
+            except ValueError:
+                pass  # Expected
+            
+            # Test 3: Empty dossier
+            with open(empty_dossier_path, 'w') as f:
+                json.dump([], f)
+            
+            try:
+                analyzer = FixedNITSAnalyzer(empty_dossier_path)
+                return False, "Should have raised ValueError for empty dossier"
+            except ValueError:
+                pass  # Expected
         
         return True, "Dossier validation working correctly"
         
@@ -268,104 +406,74 @@ def test_dossier_validation() -> Tuple[bool, str]:
 def test_safe_context_extraction() -> Tuple[bool, str]:
     """Test 6 (FIX #3): Safe context extraction with bounds checking"""
     try:
-        from critical_fixes import FixedNITSAnalyzer, create_sample_dossier
-        
-        # Create temp dossier
-        test_dossier = "test_dossier.json"
-        create_sample_dossier(test_dossier)
-        
-        analyzer = FixedNITSAnalyzer(test_dossier)
+        analyzer = _shared_analyzer()
         
         # Test with short text
         short_text = "Short text"
         context = analyzer.extract_safe_context(short_text, 5, context_size=100)
         
         if not context:
-            Path(test_dossier).unlink()
             return False, "Failed to extract context from short text"
         
         # Test with boundary position
         context = analyzer.extract_safe_context(short_text, 0, context_size=50)
         if not context:
-            Path(test_dossier).unlink()
             return False, "Failed at boundary position"
         
         # Test with position beyond text length (should not crash)
         context = analyzer.extract_safe_context(short_text, 1000, context_size=50)
         
-        # Cleanup
-        Path(test_dossier).unlink()
-        
         return True, "Context extraction handles boundaries safely"
         
     except Exception as e:
-        if Path("test_dossier.json").exists():
-            Path("test_dossier.json").unlink()
         return False, f"Error: {str(e)}"
 
 
 def test_vectorizer_caching() -> Tuple[bool, str]:
-    """Test 7 (FIX #4): TF-IDF vectorizer caching for performance"""
+    """Test 7 (FIX #4): Keyword vectorizer caching for performance"""
     try:
         # Check if sklearn is available
-        try:
-            import sklearn
-        except ImportError:
+        if not _module_available("sklearn"):
             return True, "scikit-learn not installed (optional)"
         
-        from critical_fixes import FixedNITSAnalyzer, create_sample_dossier
-        
-        # Create temp dossier
-        test_dossier = "test_dossier.json"
-        create_sample_dossier(test_dossier)
-        
         # Initialize analyzer (should pre-compute vectors)
-        analyzer = FixedNITSAnalyzer(test_dossier)
+        analyzer = _shared_analyzer()
         
         # Check if vectorizer was cached
         if analyzer.vectorizer is None:
-            Path(test_dossier).unlink()
             return False, "Vectorizer was not cached during initialization"
         
         # Test performance: Process multiple documents
         test_text = "This is a test document with some fraud and misleading information."
         
+        texts = [test_text] * 10
+        names = [f"doc{i}.txt" for i in range(10)]
+        
         start_time = time.time()
-        for i in range(10):
-            result = analyzer.analyze_sec_document(test_text, f"doc{i}.txt")
+        results = analyzer.analyze_sec_documents_batch(texts, names)
         elapsed = time.time() - start_time
         
-        # Cleanup
-        Path(test_dossier).unlink()
+        if len(results) != 10:
+            return False, f"Batch analysis returned {len(results)} results (expected 10)"
         
-        # Should process 10 documents in under 2 seconds with caching
-        if elapsed > 5.0:
-            return False, f"Performance issue: 10 docs took {elapsed:.2f}s (expected <2s)"
+        # Should process 10 documents in under 1 second with caching
+        if elapsed > 1.0:
+            return False, f"Performance issue: 10 docs took {elapsed:.2f}s (expected <1s)"
         
         return True, f"Vectorizer cached, 10 docs processed in {elapsed:.2f}s"
         
     except Exception as e:
-        if Path("test_dossier.json").exists():
-            Path("test_dossier.json").unlink()
         return False, f"Error: {str(e)}"
 
 
 def test_negation_detection() -> Tuple[bool, str]:
     """Test 8 (FIX #5): Fuzzy matching with negation detection"""
     try:
-        # Check if fuzzywuzzy is available
-        try:
-            import fuzzywuzzy
-        except ImportError:
-            return True, "fuzzywuzzy not installed (optional)"
+        # Check if rapidfuzz is available
+        if not _module_available("rapidfuzz"):
+            return True, "rapidfuzz not installed (optional)"
         
-        from critical_fixes import FixedNITSAnalyzer, create_sample_dossier
-        
-        # Create temp dossier
-        test_dossier = "test_dossier.json"
-        create_sample_dossier(test_dossier)
-        
-        analyzer = FixedNITSAnalyzer(test_dossier)
+        analyzer = _shared_analyzer()
         
         # Test with negated statement
         negated_text = "We do not have any safety violations."
@@ -373,7 +481,6 @@ def test_negation_detection() -> Tuple[bool, str]:
         
         # Should not match due to "do not" negation
         if len(matches) > 0:
-            Path(test_dossier).unlink()
             return False, "Failed to detect negation: false positive"
         
         # Test with non-negated statement
@@ -382,31 +489,18 @@ def test_negation_detection() -> Tuple[bool, str]:
         
         # Should match
         if len(matches) == 0:
-            Path(test_dossier).unlink()
             return False, "Failed to match non-negated text"
         
-        # Cleanup
-        Path(test_dossier).unlink()
-        
         return True, "Negation detection working correctly"
         
     except Exception as e:
-        if Path("test_dossier.json").exists():
-            Path("test_dossier.json").unlink()
         return False, f"Error: {str(e)}"
 
 
 def test_thread_safe_operations() -> Tuple[bool, str]:
     """Test 9 (FIX #6): Thread-safe batch processing"""
     try:
-        from critical_fixes import FixedNITSAnalyzer, create_sample_dossier
-        import threading
-        
-        # Create temp dossier
-        test_dossier = "test_dossier.json"
-        create_sample_dossier(test_dossier)
-        
-        analyzer = FixedNITSAnalyzer(test_dossier)
+        analyzer = _shared_analyzer()
         
         # Test file lock creation
         lock1 = analyzer._get_file_lock("test_file_1.txt")
@@ -414,23 +508,16 @@ def test_thread_safe_operations() -> Tuple[bool, str]:
         
         # Should return same lock for same file
         if lock1 is not lock2:
-            Path(test_dossier).unlink()
             return False, "File locking not working correctly"
         
         # Test different files get different locks
         lock3 = analyzer._get_file_lock("test_file_2.txt")
         if lock1 is lock3:
-            Path(test_dossier).unlink()
             return False, "Different files should have different locks"
         
-        # Cleanup
-        Path(test_dossier).unlink()
-        
         return True, "Thread-safe operations working correctly"
         
     except Exception as e:
-        if Path("test_dossier.json").exists():
-            Path("test_dossier.json").unlink()
         return False, f"Error: {str(e)}"
 
 
@@ -446,15 +533,19 @@ def test_rate_limiting() -> Tuple[bool, str]:
         for i in range(5):
             limiter.wait_if_needed()
         
-        # Next request should trigger wait
-        start_time = time.time()
-        limiter.wait_if_needed()
-        elapsed = time.time() - start_time
+        # Next request should trigger a wait; patch sleep so the suite
+        # verifies the computed delay without blocking for it
+        with mock.patch("critical_fixes.time.sleep") as mock_sleep:
+            limiter.wait_if_needed()
         
-        # Should have waited (even if briefly)
-        # Note: In real scenario with actual API calls, this would wait longer
+        if mock_sleep.call_count < 1:
+            return False, "Rate limiter did not wait after exceeding limit"
         
-        return True, "Rate limiter initialized and functional"
+        wait_time = mock_sleep.call_args[0][0]
+        if wait_time <= 0:
+            return False, f"Rate limiter computed non-positive wait: {wait_time}"
+        
+        return True, f"Rate limiter enforced {wait_time:.1f}s wait after limit"
         
     except Exception as e:
         return False, f"Error: {str(e)}"
@@ -463,13 +554,7 @@ def test_rate_limiting() -> Tuple[bool, str]:
 def test_end_to_end_analysis() -> Tuple[bool, str]:
     """Test 11: End-to-end document analysis"""
     try:
-        from critical_fixes import FixedNITSAnalyzer, create_sample_dossier
-        
-        # Create temp dossier
-        test_dossier = "test_dossier.json"
-        create_sample_dossier(test_dossier)
-        
-        analyzer = FixedNITSAnalyzer(test_dossier)
+        analyzer = _shared_analyzer()
         
         # Test document with known violations
         test_doc = """
@@ -481,9 +566,6 @@ def test_end_to_end_analysis() -> Tuple[bool, str]:
         
         result = analyzer.analyze_sec_document(test_doc, "test_doc.txt")
         
-        # Cleanup
-        Path(test_dossier).unlink()
-        
         # Should detect violations
         if result.total_violations == 0:
             return False, "Failed to detect any violations in test document"
@@ -500,11 +582,13 @@ def test_end_to_end_analysis() -> Tuple[bool, str]:
         return True, f"Analysis complete: {result.total_violations} violations, threat: {result.threat_score:.1f}"
         
     except Exception as e:
-        if Path("test_dossier.json").exists():
-            Path("test_dossier.json").unlink()
         return False, f"Error: {str(e)}"
 
 
+# Tests 4-11 exercise critical_fixes and cascade-fail without these
+CORE_PREREQS = ("Dependency Check", "Module Import")
+
+
 def main():
     """Run all diagnostics"""
     diagnostics = NITSDiagnostics()
@@ -513,17 +597,19 @@ def main():
     # Run all tests
     print(f"{Colors.BOLD}Running System Diagnostics...{Colors.ENDC}")
     
-    diagnostics.run_test("Dependency Check", test_dependencies)
-    diagnostics.run_test("Module Import", test_critical_fixes_import)
-    diagnostics.run_test("Sample Dossier Creation", test_sample_dossier_creation)
-    diagnostics.run_test("Binary Detection (FIX #1)", test_binary_detection)
-    diagnostics.run_test("Dossier Validation (FIX #2)", test_dossier_validation)
-    diagnostics.run_test("Safe Context Extraction (FIX #3)", test_safe_context_extraction)
-    diagnostics.run_test("Vectorizer Caching (FIX #4)", test_vectorizer_caching)
-    diagnostics.run_test("Negation Detection (FIX #5)", test_negation_detection)
-    diagnostics.run_test("Thread Safety (FIX #6)", test_thread_safe_operations)
-    diagnostics.run_test("Rate Limiting (FIX #7)", test_rate_limiting)
-    diagnostics.run_test("End-to-End Analysis", test_end_to_end_analysis)
+    diagnostics.run_tests([
+        ("Dependency Check", test_dependencies),
+        ("Module Import", test_critical_fixes_import),
+        ("Sample Dossier Creation", test_sample_dossier_creation),
+        ("Binary Detection (FIX #1)", test_binary_detection, CORE_PREREQS),
+        ("Dossier Validation (FIX #2)", test_dossier_validation, CORE_PREREQS),
+        ("Safe Context Extraction (FIX #3)", test_safe_context_extraction, CORE_PREREQS),
+        ("Vectorizer Caching (FIX #4)", test_vectorizer_caching, CORE_PREREQS),
+        ("Negation Detection (FIX #5)", test_negation_detection, CORE_PREREQS),
+        ("Thread Safety (FIX #6)", test_thread_safe_operations, CORE_PREREQS),
+        ("Rate Limiting (FIX #7)", test_rate_limiting, CORE_PREREQS),
+        ("End-to-End Analysis", test_end_to_end_analysis, CORE_PREREQS),
+    ])
     
     # Print summary
     score = diagnostics.print_summary()
@@ -0,0 +1,78 @@
+"""
+Gunicorn configuration for the NITS ML service
+Run from ml_service/: gunicorn -c gunicorn_conf.py main:app
+
+On CPU the app is preloaded in the master and the transformer models are
+loaded there once, before forking, so every worker shares the model weights
+through copy-on-write pages instead of holding its own copy. The master
+loads them with a single torch thread so no OpenMP pool exists at fork time.
+PaddleOCR (MKLDNN/OpenMP thread pools) is still loaded in each worker.
+
+A CUDA context cannot survive fork, so when a GPU is visible nothing is
+preloaded: each worker imports the app and loads every model itself after
+it has forked. Each GPU worker holds its own copy of the weights in GPU
+memory, so size NITS_ML_WORKERS to what the GPU can hold.
+
+Defaults suit a few heavy requests (one process, threaded). For many small
+requests raise NITS_ML_WORKERS towards the core count; on CPU preloading
+keeps the extra workers cheap in memory.
+"""
+
+import os
+
+# The NVML-based check answers without initialising the CUDA driver, so the
+# master can pick the deploy mode and still fork workers that may use CUDA
+os.environ.setdefault("PYTORCH_NVML_BASED_CUDA_CHECK", "1")
+
+def _cuda_visible() -> bool:
+    try:
+        import torch
+    except ImportError:
+        return False
+    return torch.cuda.is_available()
+
+CUDA_DEPLOY = _cuda_visible()
+
+bind = os.environ.get("NITS_ML_BIND", "0.0.0.0:5000")
+workers = int(os.environ.get("NITS_ML_WORKERS", "1"))
+threads = int(os.environ.get("NITS_ML_THREADS", "8"))
+worker_class = "gthread"
+preload_app = not CUDA_DEPLOY
+timeout = 120
+keepalive = 5
+
+
+def on_starting(server):
+    """Load the shared CPU models in the master (after the preloaded import, before fork)"""
+    if not preload_app:
+        return
+    import torch
+    torch.set_num_threads(1)
+    from main import initialize_models
+    initialize_models(include_ocr=False)
+
+
+def post_fork(server, worker):
+    """Split the cores between workers so torch does not oversubscribe them"""
+    import torch
+    torch.set_num_threads(max(1, (os.cpu_count() or 1) // workers))
+
+
+def when_ready(server):
+    """Warn at startup when the worker count rules out async PDF OCR"""
+    if server.cfg.workers > 1:
+        server.log.warning(
+            "Async PDF OCR is disabled: its job table is per process, "
+            "so it needs NITS_ML_WORKERS=1 (got %d)", server.cfg.workers
+        )
+
+
+def post_worker_init(worker):
+    """Load the models that must not cross fork, inside the worker"""
+    import main
+    # /ocr/<job_id> polls must reach the worker that holds the job
+    main.ASYNC_OCR_ENABLED = worker.cfg.workers == 1
+    if preload_app:
+        main.initialize_ocr()
+    else:
+        main.initialize_models()
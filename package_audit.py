@@ -5,124 +5,171 @@ Analyzes package-lock.json for dependency bloat, duplicates, and optimization op
 """
 
 import json
+import re
 import sys
 from collections import defaultdict, Counter
 from pathlib import Path
 
+# Streaming JSON parser - keeps memory flat on huge lock files
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+    JSON_ERRORS = (ValueError, ijson.JSONError)
+except ImportError:
+    IJSON_AVAILABLE = False
+    JSON_ERRORS = (ValueError,)
+
+# Common dev tooling that should not end up in production dependencies
+BLOAT_PATTERN = re.compile(r'babel|webpack|eslint|postcss', re.IGNORECASE)
+
+def iter_lock_packages(lock_file):
+    """Yield (path, pkg_info) pairs from the "packages" map of an open lock file
+    
+    With ijson each entry is parsed and handed over on its own, so the
+    full lock file is never held in memory at once.
+    """
+    with lock_file:
+        if IJSON_AVAILABLE:
+            yield from ijson.kvitems(lock_file, 'packages')
+        else:
+            yield from json.load(lock_file).get('packages', {}).items()
+
 def load_package_lock():
-    """Load and parse package-lock.json"""
+    """Open package-lock.json and return an iterator over its packages"""
     try:
-        with open('package-lock.json', 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return iter_lock_packages(open('package-lock.json', 'rb'))
     except Exception as e:
         print(f"Error loading package-lock.json: {e}")
         return None
 
-def analyze_dependencies(package_lock):
-    """Analyze dependency structure for bloat and issues"""
-    if not package_lock:
-        return None
-    
-    packages = package_lock.get('packages', {})
+def analyze_dependencies(packages):
+    """Analyze dependency structure for bloat and issues
     
-    # Remove root package entry for analysis
-    root_key = ""
-    if root_key in packages:
-        root_package = packages[root_key]
-        packages = {k: v for k, v in packages.items() if k != root_key}
+    Takes the (path, pkg_info) iterator from load_package_lock and
+    consumes it in a single pass.
+    """
+    if packages is None:
+        return None
     
-    total_packages = len(packages)
+    root_package = None
+    total_packages = 0
     
     # Analyze package names and versions
     package_names = defaultdict(list)
-    dev_packages = []
-    prod_packages = []
+    version_sets = defaultdict(set)
+    dev_count = 0
+    prod_count = 0
     large_packages = []
     
-    for path, pkg_info in packages.items():
-        # Extract package name from path
-        pkg_name = path.split('/')[-1] if '/' in path else path.replace('node_modules/', '')
-        
-        version = pkg_info.get('version', 'unknown')
-        package_names[pkg_name].append({
-            'path': path,
-            'version': version,
-            'dev': pkg_info.get('dev', False),
-            'size_indicator': len(str(pkg_info))  # Rough size indicator
-        })
-        
-        if pkg_info.get('dev', False):
-            dev_packages.append(pkg_name)
-        else:
-            prod_packages.append(pkg_name)
+    try:
+        for path, pkg_info in packages:
+            # Keep the root package entry out of the analysis
+            if path == "":
+                root_package = pkg_info
+                continue
+            
+            total_packages += 1
             
-        # Flag potentially large packages based on JSON size
-        if len(str(pkg_info)) > 500:
-            large_packages.append({
-                'name': pkg_name,
+            # Extract package name from path
+            pkg_name = path.split('/')[-1] if '/' in path else path.replace('node_modules/', '')
+            
+            version = pkg_info.get('version', 'unknown')
+            size_indicator = len(str(pkg_info))  # Rough size indicator, computed once
+            package_names[pkg_name].append({
                 'path': path,
-                'size_indicator': len(str(pkg_info))
+                'version': version,
+                'dev': pkg_info.get('dev', False),
+                'size_indicator': size_indicator
             })
+            version_sets[pkg_name].add(version)
+            
+            if pkg_info.get('dev', False):
+                dev_count += 1
+            else:
+                prod_count += 1
+                
+            # Flag potentially large packages based on JSON size
+            if size_indicator > 500:
+                large_packages.append({
+                    'name': pkg_name,
+                    'path': path,
+                    'size_indicator': size_indicator
+                })
+    except JSON_ERRORS as e:
+        print(f"Error parsing package-lock.json: {e}")
+        return None
     
     return {
         'total_packages': total_packages,
         'package_names': package_names,
-        'dev_count': len(dev_packages),
-        'prod_count': len(prod_packages),
+        'version_sets': version_sets,
+        'dev_count': dev_count,
+        'prod_count': prod_count,
         'large_packages': sorted(large_packages, key=lambda x: x['size_indicator'], reverse=True),
-        'root_package': root_package if 'root_package' in locals() else None
+        'root_package': root_package
     }
 
-def find_duplicates(package_names):
-    """Find packages with multiple versions"""
-    duplicates = {}
+def analyze_names(package_names, version_sets=None):
+    """Find duplicate and suspicious packages in a single pass over package_names
     
-    for name, versions in package_names.items():
-        if len(versions) > 1:
-            unique_versions = set(v['version'] for v in versions)
-            if len(unique_versions) > 1:
-                duplicates[name] = {
-                    'versions': list(unique_versions),
-                    'count': len(versions),
-                    'paths': [v['path'] for v in versions]
-                }
-    
-    return duplicates
-
-def check_suspicious_packages(package_names):
-    """Check for suspicious or potentially problematic packages"""
+    version_sets is the per-name set of versions collected while the lock
+    file was analyzed; it is rebuilt from package_names when omitted.
+    Returns (duplicates, suspicious).
+    """
+    if version_sets is None:
+        version_sets = {name: {v['version'] for v in versions} for name, versions in package_names.items()}
+    
+    duplicates = {}
     suspicious = []
     
     for name, versions in package_names.items():
+        # Packages with multiple versions
+        unique_versions = version_sets[name]
+        if len(unique_versions) > 1:
+            duplicates[name] = {
+                'versions': list(unique_versions),
+                'count': len(versions),
+                'paths': [v['path'] for v in versions]
+            }
+        
+        # Check for common bloat packages (depends on the name only)
+        is_bloat = BLOAT_PATTERN.search(name) is not None
+        
         for version_info in versions:
             version = version_info['version']
+            path = version_info['path']
             
             # Check for unusually high version numbers
             if version != 'unknown':
                 try:
-                    major = int(version.split('.')[0])
-                    if major > 20:  # Suspiciously high major version
-                        suspicious.append({
-                            'name': name,
-                            'version': version,
-                            'issue': 'Unusually high major version',
-                            'path': version_info['path']
-                        })
-                except:
-                    pass
-            
-            # Check for common bloat packages
-            bloat_indicators = ['babel', 'webpack', 'eslint', 'postcss']
-            if any(indicator in name.lower() for indicator in bloat_indicators):
-                if not version_info['dev']:
+                    major = int(version.split('.', 1)[0])
+                except (ValueError, AttributeError):
+                    major = 0
+                if major > 20:  # Suspiciously high major version
                     suspicious.append({
                         'name': name,
                         'version': version,
-                        'issue': 'Dev tool in production dependencies',
-                        'path': version_info['path']
+                        'issue': 'Unusually high major version',
+                        'path': path
                     })
-    
-    return suspicious
+            
+            if is_bloat and not version_info['dev']:
+                suspicious.append({
+                    'name': name,
+                    'version': version,
+                    'issue': 'Dev tool in production dependencies',
+                    'path': path
+                })
+    
+    return duplicates, suspicious
+
+def find_duplicates(package_names, version_sets=None):
+    """Find packages with multiple versions"""
+    return analyze_names(package_names, version_sets)[0]
+
+def check_suspicious_packages(package_names, version_sets=None):
+    """Check for suspicious or potentially problematic packages"""
+    return analyze_names(package_names, version_sets)[1]
 
 def generate_report(analysis):
     """Generate comprehensive audit report"""
@@ -151,7 +198,7 @@ def generate_report(analysis):
     print(f"Bloat factor: {analysis['total_packages'] / max(declared_deps + declared_dev_deps, 1):.1f}x")
     
     # Find duplicates
-    duplicates = find_duplicates(analysis['package_names'])
+    duplicates, suspicious = analyze_names(analysis['package_names'], analysis['version_sets'])
     if duplicates:
         print(f"\nDUPLICATE PACKAGES ({len(duplicates)} packages with multiple versions):")
         for name, info in sorted(duplicates.items())[:10]:  # Show top 10
@@ -164,7 +211,6 @@ def generate_report(analysis):
             print(f"  {pkg['name']} - Size indicator: {pkg['size_indicator']}")
     
     # Check suspicious packages
-    suspicious = check_suspicious_packages(analysis['package_names'])
     if suspicious:
         print(f"\nSUSPICIOUS PACKAGES ({len(suspicious)} issues found):")
         for issue in suspicious[:10]:  # Show top 10
@@ -17,10 +17,16 @@ import time
 import logging
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, List
-from dataclasses import dataclass, asdict
+from typing import Dict, Any, List, Tuple
 import threading
 
+# Fast JSON encoding for metric snapshots
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Configure logging as per DEPLOYMENT_FIX_GUIDE
 logging.basicConfig(
     level=logging.INFO,
@@ -33,19 +39,53 @@ logging.basicConfig(
 logger = logging.getLogger('NITS.Monitor')
 
 
-@dataclass
 class PerformanceMetrics:
-    """Track system performance metrics"""
-    timestamp: str
-    documents_processed: int = 0
-    processing_time_seconds: float = 0.0
-    violations_found: int = 0
-    errors_count: int = 0
-    success_rate: float = 100.0
-    avg_processing_speed: float = 0.0  # docs per minute
+    """Track system performance metrics
+    
+    A plain __slots__ class rather than a dataclass: all fields are flat
+    scalars, so to_dict can build the dict directly instead of going
+    through dataclasses.asdict's recursive copy.
+    """
+    __slots__ = (
+        'timestamp', 'documents_processed', 'processing_time_seconds',
+        'violations_found', 'errors_count', 'success_rate', 'avg_processing_speed'
+    )
+    
+    def __init__(self,
+                 timestamp: str,
+                 documents_processed: int = 0,
+                 processing_time_seconds: float = 0.0,
+                 violations_found: int = 0,
+                 errors_count: int = 0,
+                 success_rate: float = 100.0,
+                 avg_processing_speed: float = 0.0):  # docs per minute
+        self.timestamp = timestamp
+        self.documents_processed = documents_processed
+        self.processing_time_seconds = processing_time_seconds
+        self.violations_found = violations_found
+        self.errors_count = errors_count
+        self.success_rate = success_rate
+        self.avg_processing_speed = avg_processing_speed
+    
+    def __repr__(self) -> str:
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"PerformanceMetrics({fields})"
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, PerformanceMetrics):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
     
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            'timestamp': self.timestamp,
+            'documents_processed': self.documents_processed,
+            'processing_time_seconds': self.processing_time_seconds,
+            'violations_found': self.violations_found,
+            'errors_count': self.errors_count,
+            'success_rate': self.success_rate,
+            'avg_processing_speed': self.avg_processing_speed,
+        }
 
 
 class ProductionMonitor:
@@ -54,8 +94,10 @@ class ProductionMonitor:
     Implements best practices from DEPLOYMENT_FIX_GUIDE.md
     """
     
-    def __init__(self, metrics_file: str = "production_metrics.json"):
+    def __init__(self, metrics_file: str = "production_metrics.jsonl", save_every: int = 100):
         self.metrics_file = Path(metrics_file)
+        self.save_every = save_every  # Append a snapshot every N events (0 disables)
+        self._save_lock = threading.Lock()  # One appender at a time, so lines never interleave
         self.current_metrics = PerformanceMetrics(
             timestamp=datetime.now().isoformat()
         )
@@ -64,6 +106,11 @@ class ProductionMonitor:
             'min_success_rate': 0.95,  # 95% success rate
             'min_processing_speed': 50  # 50 docs/min from guide
         }
+        # Thresholds in the units record_processing works in, so the
+        # per-event alert check does no extra arithmetic
+        self._error_thresh = self.alert_threshold['error_rate']
+        self._success_thresh_pct = self.alert_threshold['min_success_rate'] * 100
+        self._speed_thresh = self.alert_threshold['min_processing_speed']
         logger.info("✅ Production Monitor initialized")
     
     def record_processing(self, 
@@ -72,64 +119,85 @@ class ProductionMonitor:
                          processing_time: float,
                          success: bool):
         """Record a document processing event"""
-        self.current_metrics.documents_processed += 1
-        self.current_metrics.processing_time_seconds += processing_time
-        self.current_metrics.violations_found += violations
+        metrics = self.current_metrics
+        metrics.documents_processed += 1
+        metrics.processing_time_seconds += processing_time
+        metrics.violations_found += violations
         
         if not success:
-            self.current_metrics.errors_count += 1
+            metrics.errors_count += 1
         
-        # Calculate success rate
-        if self.current_metrics.documents_processed > 0:
-            self.current_metrics.success_rate = (
-                (self.current_metrics.documents_processed - self.current_metrics.errors_count) /
-                self.current_metrics.documents_processed * 100
-            )
+        # Derive the rates once; _check_alerts reuses them
+        n = metrics.documents_processed
+        errors = metrics.errors_count
+        error_rate = errors / n
+        metrics.success_rate = (n - errors) / n * 100
         
         # Calculate processing speed (docs/min)
-        if self.current_metrics.processing_time_seconds > 0:
-            self.current_metrics.avg_processing_speed = (
-                self.current_metrics.documents_processed /
-                (self.current_metrics.processing_time_seconds / 60)
-            )
-        
-        # Log processing
-        status = "✅" if success else "❌"
+        if metrics.processing_time_seconds > 0:
+            metrics.avg_processing_speed = n * 60 / metrics.processing_time_seconds
+        
+        # Log processing (formatted lazily, only if INFO is enabled)
         logger.info(
-            f"{status} Processed: {document_name} | "
-            f"Violations: {violations} | "
-            f"Time: {processing_time:.2f}s"
+            "%s Processed: %s | Violations: %s | Time: %.2fs",
+            "✅" if success else "❌", document_name, violations, processing_time
         )
         
         # Check for alerts
-        self._check_alerts()
-    
-    def _check_alerts(self):
-        """Check metrics against thresholds and send alerts"""
-        error_rate = (self.current_metrics.errors_count / 
-                     max(self.current_metrics.documents_processed, 1))
-        
-        # Alert on high error rate
-        if error_rate > self.alert_threshold['error_rate']:
-            self._send_alert(
-                f"⚠️  HIGH ERROR RATE: {error_rate*100:.1f}% "
-                f"(threshold: {self.alert_threshold['error_rate']*100}%)"
-            )
-        
-        # Alert on low success rate
-        if self.current_metrics.success_rate < self.alert_threshold['min_success_rate'] * 100:
-            self._send_alert(
-                f"⚠️  LOW SUCCESS RATE: {self.current_metrics.success_rate:.1f}% "
-                f"(threshold: {self.alert_threshold['min_success_rate']*100}%)"
-            )
-        
-        # Alert on slow processing
-        if (self.current_metrics.avg_processing_speed > 0 and 
-            self.current_metrics.avg_processing_speed < self.alert_threshold['min_processing_speed']):
-            self._send_alert(
-                f"⚠️  SLOW PROCESSING: {self.current_metrics.avg_processing_speed:.1f} docs/min "
-                f"(threshold: {self.alert_threshold['min_processing_speed']} docs/min)"
-            )
+        self._check_alerts(error_rate, metrics.success_rate, metrics.avg_processing_speed)
+        
+        if self.save_every and n % self.save_every == 0:
+            self.save_metrics()
+    
+    def _evaluate(self, error_rate: float, success_rate: float, speed: float) -> List[Tuple[str, float]]:
+        """
+        Compare rates against the alert thresholds
+        
+        Returns (check, value) for each breached threshold only, so callers
+        format messages just for the alerts that actually fire.
+        """
+        breaches = []
+        
+        if error_rate > self._error_thresh:
+            breaches.append(('error_rate', error_rate))
+        
+        if success_rate < self._success_thresh_pct:
+            breaches.append(('success_rate', success_rate))
+        
+        if 0 < speed < self._speed_thresh:
+            breaches.append(('processing_speed', speed))
+        
+        return breaches
+    
+    def _current_rates(self) -> Tuple[float, float, float]:
+        """Error rate, success rate and speed from the current metrics"""
+        metrics = self.current_metrics
+        error_rate = metrics.errors_count / max(metrics.documents_processed, 1)
+        return error_rate, metrics.success_rate, metrics.avg_processing_speed
+    
+    def _check_alerts(self, error_rate: float, success_rate: float, speed: float):
+        """Check the rates computed by record_processing against thresholds and send alerts"""
+        for check, value in self._evaluate(error_rate, success_rate, speed):
+            # Alert on high error rate
+            if check == 'error_rate':
+                self._send_alert(
+                    f"⚠️  HIGH ERROR RATE: {value*100:.1f}% "
+                    f"(threshold: {self._error_thresh*100}%)"
+                )
+            
+            # Alert on low success rate
+            elif check == 'success_rate':
+                self._send_alert(
+                    f"⚠️  LOW SUCCESS RATE: {value:.1f}% "
+                    f"(threshold: {self._success_thresh_pct}%)"
+                )
+            
+            # Alert on slow processing
+            else:
+                self._send_alert(
+                    f"⚠️  SLOW PROCESSING: {value:.1f} docs/min "
+                    f"(threshold: {self._speed_thresh} docs/min)"
+                )
     
     def _send_alert(self, message: str):
         """
@@ -144,13 +212,26 @@ class ProductionMonitor:
         # - trigger_pagerduty(message)
     
     def save_metrics(self):
-        """Save current metrics to file"""
-        try:
-            with open(self.metrics_file, 'w') as f:
-                json.dump(self.current_metrics.to_dict(), f, indent=2)
-            logger.info(f"💾 Metrics saved to {self.metrics_file}")
-        except Exception as e:
-            logger.error(f"❌ Failed to save metrics: {e}")
+        """Append a snapshot of the current metrics to the metrics file
+        
+        The file is NDJSON (one JSON object per line), so each save is a
+        single small append rather than a rewrite of the whole file.
+        Appends are serialized, so concurrent saves never interleave lines.
+        """
+        with self._save_lock:
+            snapshot = self.current_metrics.to_dict()
+            snapshot['saved_at'] = datetime.now().isoformat()
+            if ORJSON_AVAILABLE:
+                line = orjson.dumps(snapshot, option=orjson.OPT_APPEND_NEWLINE)
+            else:
+                line = (json.dumps(snapshot, ensure_ascii=False) + '\n').encode('utf-8')
+            try:
+                with open(self.metrics_file, 'ab') as f:
+                    f.write(line)
+            except Exception as e:
+                logger.error(f"❌ Failed to save metrics: {e}")
+                return
+        logger.info(f"💾 Metrics saved to {self.metrics_file}")
     
     def get_summary(self) -> Dict[str, Any]:
         """Get current performance summary"""
@@ -174,18 +255,13 @@ class ProductionMonitor:
         """Get list of active alerts"""
         alerts = []
         
-        error_rate = (self.current_metrics.errors_count / 
-                     max(self.current_metrics.documents_processed, 1))
-        
-        if error_rate > self.alert_threshold['error_rate']:
-            alerts.append(f"High error rate: {error_rate*100:.1f}%")
-        
-        if self.current_metrics.success_rate < self.alert_threshold['min_success_rate'] * 100:
-            alerts.append(f"Low success rate: {self.current_metrics.success_rate:.1f}%")
-        
-        if (self.current_metrics.avg_processing_speed > 0 and 
-            self.current_metrics.avg_processing_speed < self.alert_threshold['min_processing_speed']):
-            alerts.append(f"Slow processing: {self.current_metrics.avg_processing_speed:.1f} docs/min")
+        for check, value in self._evaluate(*self._current_rates()):
+            if check == 'error_rate':
+                alerts.append(f"High error rate: {value*100:.1f}%")
+            elif check == 'success_rate':
+                alerts.append(f"Low success rate: {value:.1f}%")
+            else:
+                alerts.append(f"Slow processing: {value:.1f} docs/min")
         
         return alerts
     
@@ -26,13 +26,13 @@ echo ""
 
 # Python packages
 echo "📦 Installing Python packages..."
-pip install PyMuPDF pandas scikit-learn fuzzywuzzy python-Levenshtein nltk > /dev/null 2>&1 || {
+pip install PyMuPDF pandas scikit-learn rapidfuzz nltk > /dev/null 2>&1 || {
     echo -e "${YELLOW}⚠️  Some Python packages may have failed. Continuing...${NC}"
 }
 
 # Verify Python installations
 echo "🔍 Verifying Python dependencies..."
-python3 -c "import fitz, sklearn, fuzzywuzzy, pandas, nltk; print('✅ All Python packages installed')" || {
+python3 -c "import fitz, sklearn, rapidfuzz, pandas, nltk; print('✅ All Python packages installed')" || {
     echo -e "${RED}❌ Python dependency verification failed${NC}"
     exit 1
 }
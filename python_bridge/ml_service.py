@@ -6,6 +6,7 @@ Provides transformer models, OCR, and advanced NLP via HTTP API
 
 from flask import Flask, request, jsonify
 from flask_cors import CORS
+from flask.json.provider import DefaultJSONProvider
 import numpy as np
 import torch
 import logging
@@ -14,24 +15,223 @@ import cv2
 from io import BytesIO
 from PIL import Image
 import json
+import struct
+import hashlib
+import os
+import sys
+import threading
+from collections import OrderedDict
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    # SIMD libjpeg-turbo decoder; needs the libturbojpeg shared library too
+    from turbojpeg import TurboJPEG, TJPF_BGR
+    _TJ = TurboJPEG()
+    TURBOJPEG_AVAILABLE = True
+except Exception:
+    TURBOJPEG_AVAILABLE = False
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger('UltimateNITS.MLService')
 
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    JSON provider that parses request bodies with orjson
+    request.json / get_json() decode straight from the body bytes, skipping
+    the bytes -> str -> dict copies of the stdlib parser (large /embed payloads)
+    """
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
+if ORJSON_AVAILABLE:
+    app.json = OrjsonProvider(app)
 CORS(app)
 
+# Entity patterns live in src/parsers so they can be used without this service
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from src.parsers.entity_patterns import find_entities
+
+class LRUCache:
+    """Thread-safe bounded mapping that evicts the least recently used entries"""
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get_many(self, keys: list) -> list:
+        """Values for keys (None for misses), marking hits as recently used"""
+        with self._lock:
+            values = []
+            for key in keys:
+                value = self._data.get(key)
+                if value is not None:
+                    self._data.move_to_end(key)
+                values.append(value)
+            return values
+    
+    def put_many(self, items: dict):
+        """Insert entries, evicting the oldest beyond maxsize"""
+        with self._lock:
+            self._data.update(items)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+def text_digest(text: str) -> bytes:
+    """Compact cache key for a text"""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
 # Global model variables
 bi_encoder = None
 cross_encoder = None
 ocr = None
 finbert_pipeline = None
+sentiment_max_length = 512
+cross_encoder_quantized = False
 models_loaded = False
 
+# Embedding inference settings: fp16 weights on GPU, fp32 on CPU
+EMBED_DEVICE = 'cuda' if torch.cuda.is_available() else 'cpu'
+EMBED_BATCH_SIZE = 64
+
+# Optional ONNX Runtime export of the bi-encoder, used on CPU when present.
+# Produce it once with:
+#   optimum-cli export onnx --model sentence-transformers/all-mpnet-base-v2 --optimize O3 ./onnx_mpnet
+#   optimum-cli onnxruntime quantize --avx512_vnni --onnx_model ./onnx_mpnet --output ./onnx_mpnet_int8
+EMBED_ONNX_DIR = os.environ.get(
+    'NITS_EMBED_ONNX_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'onnx_mpnet_int8')
+)
+EMBED_MAX_SEQ_LENGTH = 384
+SENTIMENT_BATCH_SIZE = 32
+CONTRADICTION_BATCH_SIZE = 32
+
+# LRU caches keyed by a blake2b digest of the text, so re-analyzed documents
+# only run the models on chunks that have not been seen. Embeddings are ~3KB
+# per entry; SEC boilerplate makes sentiment hits common and entries are tiny
+EMBED_CACHE_SIZE = 50_000
+SENTIMENT_CACHE_SIZE = 100_000
+_EMB_CACHE = LRUCache(EMBED_CACHE_SIZE)
+_SENTIMENT_CACHE = LRUCache(SENTIMENT_CACHE_SIZE)
+
+# Images whose longer side exceeds this are decoded at half resolution.
+# PaddleOCR's detector downsizes inputs to ~960px anyway, so the halved
+# image still carries more detail than the model consumes
+OCR_REDUCE_MIN_SIDE = 4000
+
+# PaddleOCR CPU pipeline: MKLDNN kernels on half the cores. The angle
+# classifier is loaded but only run when a request sets "angle_cls": true
+OCR_CPU_THREADS = max(1, (os.cpu_count() or 1) // 2)
+OCR_ANGLE_CLS_DEFAULT = False
+
+# Background PDF OCR: the pool is created on first use (never at import,
+# so nothing forks before the server does). Finished jobs are removed once
+# their result has been fetched, or OCR_JOB_TTL seconds after they finish if
+# nobody polls, and at most OCR_MAX_JOBS are tracked at once.
+# The job table lives in this process, so async PDF OCR only works when the
+# service runs as a single worker (gunicorn_conf.py clears ASYNC_OCR_ENABLED
+# otherwise and polls landing on another worker would 404)
+OCR_JOB_TTL = 3600
+OCR_MAX_JOBS = 1024
+ASYNC_OCR_ENABLED = True
+_PDF_POOL = None
+_PDF_POOL_LOCK = threading.Lock()
+_JOBS: Dict[str, Future] = {}
+_JOB_FINISHED: Dict[str, float] = {}
+_JOBS_LOCK = threading.Lock()
+
+class OnnxSentenceEncoder:
+    """
+    SentenceTransformer stand-in that runs an exported all-mpnet-base-v2 on
+    ONNX Runtime (fused graph, optionally int8). Mirrors the model's
+    Transformer -> mean pooling -> L2 normalize pipeline
+    """
+    
+    def __init__(self, model_dir: str):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+        
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = os.cpu_count() or 1
+        
+        self.session = ort.InferenceSession(
+            os.path.join(model_dir, 'model.onnx'),
+            sess_options=options,
+            providers=['CPUExecutionProvider']
+        )
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+    
+    def encode(self, texts: list, batch_size: int = 32, convert_to_numpy: bool = True) -> np.ndarray:
+        # Length-sorted batches keep padding minimal, as SentenceTransformer does
+        order = np.argsort([-len(text) for text in texts], kind='stable')
+        pooled = np.empty((len(texts), 0), dtype=np.float32)
+        
+        for start in range(0, len(texts), batch_size):
+            batch_idx = order[start:start + batch_size]
+            encoded = self.tokenizer(
+                [texts[i] for i in batch_idx],
+                padding=True,
+                truncation=True,
+                max_length=EMBED_MAX_SEQ_LENGTH,
+                return_tensors='np'
+            )
+            feeds = {name: value.astype(np.int64) for name, value in encoded.items() if name in self.input_names}
+            token_embeddings = self.session.run(None, feeds)[0]
+            
+            mask = encoded['attention_mask'][..., None].astype(np.float32)
+            means = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            if pooled.shape[1] == 0:
+                pooled = np.empty((len(texts), means.shape[1]), dtype=np.float32)
+            pooled[batch_idx] = means
+        
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        return pooled / np.clip(norms, 1e-12, None)
+
+def load_onnx_encoder():
+    """ONNX bi-encoder if an export is present and loads on CPU, else None"""
+    if EMBED_DEVICE != 'cpu' or not os.path.isfile(os.path.join(EMBED_ONNX_DIR, 'model.onnx')):
+        return None
+    try:
+        encoder = OnnxSentenceEncoder(EMBED_ONNX_DIR)
+        logger.info(f"✅ ONNX bi-encoder loaded from {EMBED_ONNX_DIR}")
+        return encoder
+    except Exception as e:
+        logger.warning(f"⚠️  ONNX bi-encoder failed to load, using PyTorch: {e}")
+        return None
+
+def quantize_cross_encoder(encoder) -> bool:
+    """
+    Dynamic int8 quantization of the cross-encoder's Linear layers for CPU
+    inference (weights stored as int8, activations quantized on the fly)
+    """
+    try:
+        encoder.model = torch.quantization.quantize_dynamic(
+            encoder.model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+        logger.info("✅ Cross-encoder quantized to int8")
+        return True
+    except Exception as e:
+        logger.warning(f"⚠️  Cross-encoder quantization failed, using fp32: {e}")
+        return False
+
 def initialize_models():
     """Initialize all ML models at startup"""
-    global bi_encoder, cross_encoder, ocr, finbert_pipeline, models_loaded
+    global bi_encoder, cross_encoder, ocr, finbert_pipeline, sentiment_max_length
+    global cross_encoder_quantized, models_loaded
     
     try:
         logger.info("🔄 Initializing ML models...")
@@ -39,8 +239,17 @@ def initialize_models():
         # Initialize sentence transformer for embeddings
         try:
             from sentence_transformers import SentenceTransformer, CrossEncoder
-            bi_encoder = SentenceTransformer('sentence-transformers/all-mpnet-base-v2')
-            cross_encoder = CrossEncoder('cross-encoder/nli-deberta-v3-base')
+            bi_encoder = load_onnx_encoder()
+            if bi_encoder is None:
+                bi_encoder = SentenceTransformer('sentence-transformers/all-mpnet-base-v2', device=EMBED_DEVICE)
+                if EMBED_DEVICE == 'cuda':
+                    # Half precision halves memory traffic and uses tensor cores
+                    bi_encoder.half()
+            cross_encoder = CrossEncoder('cross-encoder/nli-deberta-v3-base', device=EMBED_DEVICE)
+            if EMBED_DEVICE == 'cuda':
+                cross_encoder.model.half()
+            else:
+                cross_encoder_quantized = quantize_cross_encoder(cross_encoder)
             logger.info("✅ Sentence transformers loaded")
         except Exception as e:
             logger.warning(f"⚠️  Sentence transformers failed to load: {e}")
@@ -49,8 +258,18 @@ def initialize_models():
         
         # Initialize OCR
         try:
+            # Thread pools read these at import, so set them first
+            os.environ.setdefault('OMP_NUM_THREADS', str(OCR_CPU_THREADS))
+            os.environ.setdefault('MKL_NUM_THREADS', str(OCR_CPU_THREADS))
             from paddleocr import PaddleOCR
-            ocr = PaddleOCR(use_angle_cls=True, lang='en', use_gpu=False)
+            ocr = PaddleOCR(
+                use_angle_cls=True,
+                lang='en',
+                use_gpu=False,
+                enable_mkldnn=True,
+                cpu_threads=OCR_CPU_THREADS,
+                rec_batch_num=16
+            )
             logger.info("✅ PaddleOCR loaded")
         except Exception as e:
             logger.warning(f"⚠️  PaddleOCR failed to load: {e}")
@@ -76,6 +295,10 @@ def initialize_models():
                 logger.warning(f"⚠️  Sentiment analysis failed to load: {e2}")
                 finbert_pipeline = None
         
+        if finbert_pipeline is not None:
+            # Truncate by tokens, capped at what the loaded model accepts
+            sentiment_max_length = min(512, finbert_pipeline.tokenizer.model_max_length)
+        
         models_loaded = True
         logger.info("✅ ML Service initialization complete")
         
@@ -83,6 +306,37 @@ def initialize_models():
         logger.error(f"❌ Failed to initialize ML models: {e}")
         models_loaded = False
 
+def fast_jsonify(payload: dict, status: int = 200):
+    """
+    JSON response that serializes numpy arrays directly via orjson
+    Falls back to jsonify (converting arrays to lists) without orjson
+    """
+    if ORJSON_AVAILABLE:
+        return app.response_class(
+            orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY),
+            status=status,
+            mimetype='application/json'
+        )
+    response = jsonify({
+        key: value.tolist() if isinstance(value, np.ndarray) else value
+        for key, value in payload.items()
+    })
+    response.status_code = status
+    return response
+
+def binary_embeddings_response(embeddings: np.ndarray):
+    """
+    Raw float16 embeddings for clients sending Accept: application/octet-stream
+    Body: 4-byte little-endian header length, JSON header, then the matrix bytes
+    """
+    header = json.dumps({
+        "dtype": "float16",
+        "shape": list(embeddings.shape),
+        "count": len(embeddings)
+    }).encode('utf-8')
+    body = struct.pack('<I', len(header)) + header + embeddings.astype(np.float16).tobytes()
+    return app.response_class(body, mimetype='application/octet-stream')
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
@@ -94,9 +348,38 @@ def health_check():
             "contradiction_detection": cross_encoder is not None,
             "ocr": ocr is not None,
             "financial_sentiment": finbert_pipeline is not None
-        }
+        },
+        "cross_encoder_quantized": cross_encoder_quantized
     })
 
+def encode_with_cache(texts: list) -> np.ndarray:
+    """Embed texts, running the encoder only on texts missing from the cache"""
+    keys = [text_digest(text) for text in texts]
+    vectors = _EMB_CACHE.get_many(keys)
+    
+    # First index of each distinct uncached text (duplicates encode once)
+    missing = {}
+    for i, (key, vector) in enumerate(zip(keys, vectors)):
+        if vector is None:
+            missing.setdefault(key, i)
+    
+    if missing:
+        # encode sorts by length internally, so each mini-batch is padded
+        # only to its own longest text
+        with torch.inference_mode():
+            fresh = bi_encoder.encode(
+                [texts[i] for i in missing.values()],
+                batch_size=EMBED_BATCH_SIZE,
+                convert_to_numpy=True
+            )
+        
+        computed = {key: np.array(row) for key, row in zip(missing, fresh)}
+        _EMB_CACHE.put_many(computed)
+        
+        vectors = [computed[key] if vector is None else vector for key, vector in zip(keys, vectors)]
+    
+    return np.stack(vectors)
+
 @app.route('/embed', methods=['POST'])
 def embed_texts():
     """Generate embeddings for text chunks"""
@@ -110,12 +393,15 @@ def embed_texts():
         if not texts:
             return jsonify({"error": "No texts provided"}), 400
         
-        # Generate embeddings
-        embeddings = bi_encoder.encode(texts, convert_to_numpy=True)
+        embeddings = encode_with_cache(texts)
         
-        return jsonify({
-            "embeddings": embeddings.tolist(),
-            "dimension": embeddings.shape[1],
+        accepted = request.accept_mimetypes.best_match(['application/json', 'application/octet-stream'])
+        if accepted == 'application/octet-stream':
+            return binary_embeddings_response(embeddings)
+        
+        return fast_jsonify({
+            "embeddings": embeddings,
+            "dimension": int(embeddings.shape[1]),
             "count": len(embeddings)
         })
         
@@ -123,6 +409,38 @@ def embed_texts():
         logger.error(f"Embedding error: {e}")
         return jsonify({"error": str(e)}), 500
 
+def cross_encoder_scores(pairs: list) -> np.ndarray:
+    """
+    Score sentence pairs with the cross-encoder's model directly
+    One tokenizer call and one inference_mode forward pass per batch, with
+    the same outputs as CrossEncoder.predict (raw logits for multi-label
+    models, sigmoid scores for single-label ones)
+    """
+    model = cross_encoder.model
+    tokenizer = cross_encoder.tokenizer
+    max_length = getattr(cross_encoder, 'max_length', None) or tokenizer.model_max_length
+    
+    batches = []
+    for start in range(0, len(pairs), CONTRADICTION_BATCH_SIZE):
+        batch = pairs[start:start + CONTRADICTION_BATCH_SIZE]
+        encoded = tokenizer(
+            [pair[0] for pair in batch],
+            [pair[1] for pair in batch],
+            padding=True,
+            truncation=True,
+            max_length=max_length,
+            return_tensors='pt'
+        ).to(model.device)
+        
+        with torch.inference_mode():
+            logits = model(**encoded).logits
+        batches.append(logits.float().cpu().numpy())
+    
+    scores = np.concatenate(batches)
+    if scores.shape[1] == 1:
+        return 1 / (1 + np.exp(-scores[:, 0]))
+    return scores
+
 @app.route('/contradiction', methods=['POST'])
 def detect_contradiction():
     """Detect contradictions between sentence pairs"""
@@ -137,36 +455,41 @@ def detect_contradiction():
             return jsonify({"error": "No sentence pairs provided"}), 400
         
         # Cross-encoder prediction
-        predictions = cross_encoder.predict(pairs)
-        
-        results = []
-        for i, pred in enumerate(predictions):
-            # Convert logits to probabilities
-            if isinstance(pred, (list, np.ndarray)) and len(pred) == 3:
-                # [contradiction, entailment, neutral]
-                probs = torch.softmax(torch.tensor(pred), dim=0).numpy()
-                contradiction_prob = float(probs[0])
-                entailment_prob = float(probs[1])
-                neutral_prob = float(probs[2])
-            else:
-                # Single score - interpret as contradiction probability
-                contradiction_prob = float(pred) if pred > 0.5 else 1 - float(pred)
-                entailment_prob = 0.0
-                neutral_prob = 1 - contradiction_prob
-            
-            label = "contradiction" if contradiction_prob > 0.5 else "neutral"
-            confidence = max(contradiction_prob, neutral_prob)
-            
-            results.append({
+        predictions = cross_encoder_scores(pairs)
+        
+        # Convert logits to probabilities for all pairs at once
+        scores = np.asarray(predictions, dtype=np.float32)
+        if scores.ndim == 2 and scores.shape[1] == 3:
+            # [contradiction, entailment, neutral] - row-wise stable softmax
+            exp = np.exp(scores - scores.max(axis=1, keepdims=True))
+            probs = exp / exp.sum(axis=1, keepdims=True)
+            contradiction, entailment, neutral = probs[:, 0], probs[:, 1], probs[:, 2]
+        else:
+            # Single score - interpret as contradiction probability
+            scores = scores.reshape(-1)
+            contradiction = np.where(scores > 0.5, scores, 1 - scores)
+            entailment = np.zeros_like(contradiction)
+            neutral = 1 - contradiction
+        
+        labels = np.where(contradiction > 0.5, "contradiction", "neutral")
+        confidence = np.maximum(contradiction, neutral)
+        
+        results = [
+            {
                 "pair_index": i,
-                "contradiction_prob": contradiction_prob,
-                "entailment_prob": entailment_prob,
-                "neutral_prob": neutral_prob,
+                "contradiction_prob": c,
+                "entailment_prob": e,
+                "neutral_prob": n,
                 "label": label,
-                "confidence": confidence
-            })
+                "confidence": conf
+            }
+            for i, (c, e, n, label, conf) in enumerate(zip(
+                contradiction.tolist(), entailment.tolist(), neutral.tolist(),
+                labels.tolist(), confidence.tolist()
+            ))
+        ]
         
-        return jsonify({"results": results})
+        return fast_jsonify({"results": results})
         
     except Exception as e:
         logger.error(f"Contradiction detection error: {e}")
@@ -185,33 +508,64 @@ def financial_sentiment():
         if not texts:
             return jsonify({"error": "No texts provided"}), 400
         
-        results = []
-        for text in texts:
-            # Truncate text to avoid token limits
-            truncated_text = text[:512] if len(text) > 512 else text
-            
+        # Truncate by tokens (not characters) so each text fills the model's
+        # context window without overflowing it
+        token_limits = {"truncation": True, "max_length": sentiment_max_length}
+        
+        # Only texts not seen before (and each distinct text once) reach the model
+        keys = [text_digest(text) for text in texts]
+        cached = _SENTIMENT_CACHE.get_many(keys)
+        missing = {}
+        for i, (key, hit) in enumerate(zip(keys, cached)):
+            if hit is None:
+                missing.setdefault(key, i)
+        
+        computed = {}
+        if missing:
+            # One batched pipeline call; on failure fall back to per-text calls
+            # so a single bad input only fails its own entry
             try:
-                sentiment_result = finbert_pipeline(truncated_text)
-                
-                # Handle different response formats
-                if isinstance(sentiment_result, list) and len(sentiment_result) > 0:
-                    result = sentiment_result[0]
-                else:
-                    result = sentiment_result
-                
-                results.append({
-                    "text": truncated_text,
-                    "label": result.get("label", "neutral"),
-                    "score": result.get("score", 0.5)
-                })
+                batch_results = finbert_pipeline(
+                    [texts[i] for i in missing.values()],
+                    batch_size=SENTIMENT_BATCH_SIZE,
+                    **token_limits
+                )
             except Exception as e:
-                logger.warning(f"Sentiment analysis failed for text: {e}")
-                results.append({
-                    "text": truncated_text,
-                    "label": "neutral",
-                    "score": 0.5,
-                    "error": str(e)
-                })
+                logger.warning(f"Batched sentiment analysis failed, retrying per text: {e}")
+                batch_results = None
+            
+            for j, (key, i) in enumerate(missing.items()):
+                try:
+                    if batch_results is not None:
+                        sentiment_result = batch_results[j]
+                    else:
+                        sentiment_result = finbert_pipeline(texts[i], **token_limits)
+                    
+                    # Handle different response formats
+                    if isinstance(sentiment_result, list) and len(sentiment_result) > 0:
+                        result = sentiment_result[0]
+                    else:
+                        result = sentiment_result
+                    
+                    computed[key] = {
+                        "label": result.get("label", "neutral"),
+                        "score": result.get("score", 0.5)
+                    }
+                except Exception as e:
+                    logger.warning(f"Sentiment analysis failed for text: {e}")
+                    computed[key] = {
+                        "label": "neutral",
+                        "score": 0.5,
+                        "error": str(e)
+                    }
+            
+            # Failures are not cached so they are retried next time
+            _SENTIMENT_CACHE.put_many({key: value for key, value in computed.items() if "error" not in value})
+        
+        results = [
+            {"text": text, **(hit if hit is not None else computed[key])}
+            for text, key, hit in zip(texts, keys, cached)
+        ]
         
         return jsonify({"sentiments": results})
         
@@ -219,6 +573,122 @@ def financial_sentiment():
         logger.error(f"Financial sentiment error: {e}")
         return jsonify({"error": str(e)}), 500
 
+def _ocr_decode_flags(img_bytes: bytes) -> int:
+    """
+    Pick the imdecode mode from the image header alone: oversized scans are
+    decoded straight to half resolution instead of full-size-then-resized
+    """
+    try:
+        # Image.open parses only the header; pixel data is never decoded here
+        with Image.open(BytesIO(img_bytes)) as probe:
+            if max(probe.size) > OCR_REDUCE_MIN_SIDE:
+                return cv2.IMREAD_REDUCED_COLOR_2
+    except Exception:
+        pass
+    return cv2.IMREAD_COLOR
+
+def _get_pdf_pool() -> ProcessPoolExecutor:
+    """Lazily create the shared PDF OCR worker pool"""
+    global _PDF_POOL
+    with _PDF_POOL_LOCK:
+        if _PDF_POOL is None:
+            _PDF_POOL = ProcessPoolExecutor(max_workers=os.cpu_count())
+        return _PDF_POOL
+
+def _prune_jobs(now: float):
+    """Drop expired finished jobs, then the oldest finished ones while over capacity (hold _JOBS_LOCK)"""
+    for job_id, finished_at in list(_JOB_FINISHED.items()):
+        if now - finished_at > OCR_JOB_TTL:
+            _JOBS.pop(job_id, None)
+            _JOB_FINISHED.pop(job_id, None)
+    
+    # _JOB_FINISHED is in completion order, so this evicts the oldest results
+    for job_id in list(_JOB_FINISHED)[:max(0, len(_JOBS) - OCR_MAX_JOBS + 1)]:
+        _JOBS.pop(job_id, None)
+        _JOB_FINISHED.pop(job_id, None)
+
+def _start_ocr_job(pdf_path: str):
+    """Queue a background PDF OCR job; None when OCR_MAX_JOBS jobs are still pending"""
+    job_id = uuid.uuid4().hex
+    with _JOBS_LOCK:
+        _prune_jobs(time.monotonic())
+        if len(_JOBS) >= OCR_MAX_JOBS:
+            return None
+        future = _JOBS[job_id] = _get_pdf_pool().submit(_ocr_pdf, pdf_path)
+    
+    # Registered outside the lock: the callback runs inline if already done
+    def _finished(_):
+        with _JOBS_LOCK:
+            if job_id in _JOBS:
+                _JOB_FINISHED[job_id] = time.monotonic()
+    
+    future.add_done_callback(_finished)
+    return job_id
+
+def _pop_finished_job(job_id: str):
+    """Remove a finished job from the table once its result is handed out"""
+    with _JOBS_LOCK:
+        _JOBS.pop(job_id, None)
+        _JOB_FINISHED.pop(job_id, None)
+
+def _ocr_pdf(pdf_path: str) -> str:
+    """
+    Rasterize a PDF and OCR its pages concurrently
+    Tesseract runs as a subprocess per page, so threads are enough to keep
+    every core busy (and, unlike a nested process pool, work inside pool workers)
+    """
+    from pdf2image import convert_from_path
+    import pytesseract
+    
+    images = convert_from_path(pdf_path, thread_count=4)
+    
+    def page_text(indexed):
+        i, img = indexed
+        try:
+            return pytesseract.image_to_string(img)
+        except Exception as e:
+            logger.error(f"OCR failed for page {i+1}: {e}")
+            return ""
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(len(images), os.cpu_count() or 1))) as executor:
+        return "\n".join(executor.map(page_text, enumerate(images)))
+
+def _decode_image(img_bytes: bytes):
+    """
+    Decode image bytes to a BGR array for OCR (None if undecodable)
+    JPEGs go through libjpeg-turbo when available, other formats and any
+    TurboJPEG failure through cv2.imdecode
+    """
+    flags = _ocr_decode_flags(img_bytes)
+    
+    if TURBOJPEG_AVAILABLE and img_bytes[:3] == b'\xff\xd8\xff':
+        try:
+            scale = (1, 2) if flags == cv2.IMREAD_REDUCED_COLOR_2 else None
+            return _TJ.decode(img_bytes, pixel_format=TJPF_BGR, scaling_factor=scale)
+        except Exception as e:
+            logger.warning(f"TurboJPEG decode failed, falling back to OpenCV: {e}")
+    
+    nparr = np.frombuffer(img_bytes, np.uint8)  # view, no copy
+    return cv2.imdecode(nparr, flags)
+
+@app.route('/ocr/<job_id>', methods=['GET'])
+def ocr_job_status(job_id):
+    """Poll a background PDF OCR job started with {"pdf_path": ..., "async": true}"""
+    with _JOBS_LOCK:
+        future = _JOBS.get(job_id)
+    if future is None:
+        return jsonify({"error": f"Unknown OCR job: {job_id}"}), 404
+    
+    if not future.done():
+        return jsonify({"job_id": job_id, "status": "pending"})
+    
+    _pop_finished_job(job_id)
+    try:
+        return jsonify({"job_id": job_id, "status": "done", "text": future.result()})
+    except Exception as e:
+        logger.error(f"OCR job {job_id} failed: {e}")
+        return jsonify({"job_id": job_id, "status": "failed", "error": str(e)}), 500
+
 @app.route('/ocr', methods=['POST'])
 def perform_ocr():
     """Perform OCR on image data or PDF file"""
@@ -228,31 +698,29 @@ def perform_ocr():
         # Check if this is PDF OCR request
         pdf_path = data.get('pdf_path')
         if pdf_path:
-            # Handle PDF OCR using pdf2image + pytesseract
+            # Handle PDF OCR using pdf2image + pytesseract (used by _ocr_pdf)
             try:
-                from pdf2image import convert_from_path
-                import pytesseract
+                import pdf2image  # noqa: F401
+                import pytesseract  # noqa: F401
             except ImportError as e:
                 return jsonify({"error": f"Required OCR dependencies not installed: {e}"}), 503
             
             # Check if PDF file exists
-            import os
             if not os.path.exists(pdf_path):
                 return jsonify({"error": f"PDF file not found: {pdf_path}"}), 404
             
-            # Convert PDF to images and extract text
-            images = convert_from_path(pdf_path)
-            text_pages = []
-            for i, img in enumerate(images):
-                try:
-                    page_text = pytesseract.image_to_string(img)
-                    text_pages.append(page_text)
-                except Exception as e:
-                    logger.error(f"OCR failed for page {i+1}: {e}")
-                    text_pages.append("")
+            # Async mode: queue the job and let the client poll /ocr/<job_id>
+            if data.get('async'):
+                if not ASYNC_OCR_ENABLED:
+                    return jsonify({
+                        "error": "Async PDF OCR needs a single-worker deployment (NITS_ML_WORKERS=1); retry without async"
+                    }), 400
+                job_id = _start_ocr_job(pdf_path)
+                if job_id is None:
+                    return jsonify({"error": "Too many pending OCR jobs, retry later"}), 503
+                return jsonify({"job_id": job_id, "status": "pending"}), 202
             
-            full_text = "\n".join(text_pages)
-            return jsonify({"text": full_text})
+            return jsonify({"text": _ocr_pdf(pdf_path)})
         
         # Handle image OCR (existing functionality)
         if not ocr:
@@ -265,8 +733,7 @@ def perform_ocr():
         # Decode base64 image
         try:
             img_bytes = base64.b64decode(image_base64)
-            nparr = np.frombuffer(img_bytes, np.uint8)
-            image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+            image = _decode_image(img_bytes)
             
             if image is None:
                 return jsonify({"error": "Invalid image data"}), 400
@@ -276,7 +743,7 @@ def perform_ocr():
         
         # Perform OCR
         try:
-            result = ocr.ocr(image, cls=True)
+            result = ocr.ocr(image, cls=bool(data.get('angle_cls', OCR_ANGLE_CLS_DEFAULT)))
             
             # Extract text and confidence scores
             extracted_text = []
@@ -318,44 +785,9 @@ def extract_entities():
         if not text:
             return jsonify({"error": "No text provided"}), 400
         
-        entities = []
-        
-        # Extract monetary amounts
-        import re
-        money_pattern = r'\$\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s*(million|billion|M|B)?'
-        for match in re.finditer(money_pattern, text, re.IGNORECASE):
-            value = float(match.group(1).replace(',', ''))
-            multiplier = match.group(2)
-            
-            if multiplier and multiplier.lower() in ['million', 'm']:
-                value *= 1e6
-            elif multiplier and multiplier.lower() in ['billion', 'b']:
-                value *= 1e9
-            
-            entities.append({
-                "type": "MONEY",
-                "text": match.group(0),
-                "value": value,
-                "position": match.start()
-            })
-        
-        # Extract regulatory citations
-        citation_pattern = r'(?:17|15|26)\s+(?:CFR|U\.S\.C\.)\s+§?\s*\d+(?:\.\d+)?(?:\([a-z]\))?'
-        for match in re.finditer(citation_pattern, text, re.IGNORECASE):
-            entities.append({
-                "type": "REGULATION",
-                "text": match.group(0),
-                "position": match.start()
-            })
-        
-        # Extract dates
-        date_pattern = r'\b(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}\b'
-        for match in re.finditer(date_pattern, text, re.IGNORECASE):
-            entities.append({
-                "type": "DATE",
-                "text": match.group(0),
-                "position": match.start()
-            })
+        # Single scan over the text; entities are grouped by type in the
+        # response (money, then regulations, then dates) as before
+        entities = find_entities(text)
         
         return jsonify({
             "entities": entities,
@@ -377,6 +809,7 @@ if __name__ == '__main__':
     print("  POST /contradiction - Detect contradictions")
     print("  POST /financial_sentiment - Financial sentiment analysis")
     print("  POST /ocr - OCR image processing")
+    print("  GET  /ocr/<job_id> - Poll an async PDF OCR job")
     print("  POST /extract_entities - Extract financial/legal entities")
     
     app.run(host='0.0.0.0', port=5000, debug=False, threaded=True)
\ No newline at end of file
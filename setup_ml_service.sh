@@ -10,7 +10,7 @@ source .venv/bin/activate || source .venv/Scripts/activate
 
 echo "📦 [2/6] Installing Required Python Packages..."
 pip install --upgrade pip
-pip install flask pdf2image pytesseract requests
+pip install flask pdf2image pytesseract requests gunicorn
 
 echo "🔧 [3/6] Installing Tesseract + Poppler..."
 OS_TYPE=$(uname)
@@ -41,4 +41,8 @@ echo "✅ Environment setup complete."
 # 🔁 RUN ML SERVICE
 # ------------------------------
 echo "🧠 [6/6] Launching ML Service..."
-python main.py
+if command -v gunicorn >/dev/null 2>&1; then
+    gunicorn -c gunicorn_conf.py main:app
+else
+    python main.py
+fi
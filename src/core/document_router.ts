@@ -108,7 +108,7 @@ export class DocumentRouter {
         
         // Calculate integrity hash
         const fileHash = crypto
-            .createHash('md5')
+            .createHash('sha256')
             .update(buffer)
             .digest('hex');
         
@@ -0,0 +1,65 @@
+"""
+Financial and Legal Entity Patterns
+Money amounts, regulation citations and dates for /extract_entities
+
+Only the standard library (plus google-re2 when installed) is imported,
+so the patterns can be used and tested without the ML service's
+torch/OpenCV stack.
+"""
+
+import re
+from typing import Any, Dict, List
+
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
+# Entity patterns combined as named alternatives and compiled once at
+# import, so each text is scanned a single time. RE2 (when installed)
+# runs the scan as a linear-time automaton instead of a backtracking
+# search, which matters on long filings
+MONEY_PATTERN = r'\$\s*(?P<amount>\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s*(?P<multiplier>million|billion|[MB]\b)?'
+CITATION_PATTERN = r'(?:17|15|26)\s+(?:CFR|U\.S\.C\.)\s+§?\s*\d+(?:\.\d+)?(?:\([a-z]\))?'
+DATE_PATTERN = r'\b(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}\b'
+
+MONEY_MULTIPLIERS = {'million': 1e6, 'm': 1e6, 'billion': 1e9, 'b': 1e9}
+
+ENTITY_PATTERN = f'(?i)(?P<money>{MONEY_PATTERN})|(?P<citation>{CITATION_PATTERN})|(?P<date>{DATE_PATTERN})'
+ENTITY_RE = re2.compile(ENTITY_PATTERN) if RE2_AVAILABLE else re.compile(ENTITY_PATTERN)
+
+
+def find_entities(text: str) -> List[Dict[str, Any]]:
+    """
+    Extract money, regulation and date entities from text in one scan
+    Entities are grouped by type: money, then regulations, then dates
+    """
+    money, regulations, dates = [], [], []
+    for match in ENTITY_RE.finditer(text):
+        if match.group('money') is not None:
+            value = float(match.group('amount').replace(',', ''))
+            multiplier = match.group('multiplier')
+            if multiplier:
+                value *= MONEY_MULTIPLIERS[multiplier.lower()]
+            
+            money.append({
+                "type": "MONEY",
+                "text": match.group(0),
+                "value": value,
+                "position": match.start()
+            })
+        elif match.group('citation') is not None:
+            regulations.append({
+                "type": "REGULATION",
+                "text": match.group(0),
+                "position": match.start()
+            })
+        else:
+            dates.append({
+                "type": "DATE",
+                "text": match.group(0),
+                "position": match.start()
+            })
+    
+    return money + regulations + dates
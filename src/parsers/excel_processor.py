@@ -1,41 +1,103 @@
 """
 Excel File Processor
 Handles both binary XLS (BIFF8) and OpenXML XLSX formats
+
+pandas, xlrd and openpyxl are imported inside the methods that need them,
+so format detection stays cheap for callers that never read any data.
 """
 
-import pandas as pd
+from __future__ import annotations
+
 import os
-from typing import Dict, Any, Optional, Union
+from functools import lru_cache
+from itertools import islice
+from typing import TYPE_CHECKING, BinaryIO, Dict, Any, Optional, Union
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# First four bytes -> (full signature, format)
+EXCEL_SIGNATURES = {
+    b'PK\x03\x04': (b'PK\x03\x04', 'xlsx'),  # XLSX/XLSM are ZIP archives
+    b'\xD0\xCF\x11\xE0': (b'\xD0\xCF\x11\xE0\xA1\xB1\x1A\xE1', 'xls'),  # OLE/CFB
+}
+
+def _match_signature(signature: bytes) -> Optional[str]:
+    """Excel format for the leading bytes of a file, or None"""
+    # ZIP (XLSX/XLSM) or OLE/CFB (XLS) signature
+    match = EXCEL_SIGNATURES.get(signature[:4])
+    if match and signature.startswith(match[0]):
+        return match[1]
+    return None
+
+def _format_from_extension(name: str) -> Optional[str]:
+    """Excel format implied by a file name's extension, or None"""
+    ext = os.path.splitext(name)[1].lower()
+    if ext in ['.xls', '.xlsx', '.xlsm']:
+        return ext[1:]  # Remove dot
+    return None
 
 class ExcelProcessor:
     """Unified Excel processor supporting .xls and .xlsx formats"""
     
     @staticmethod
-    def detect_excel_format(file_path: str) -> str:
-        """Detect Excel format by reading file signature"""
+    def detect_excel_format(source: Union[str, os.PathLike, bytes, bytearray, memoryview, BinaryIO]) -> str:
+        """
+        Detect Excel format by reading file signature
         
-        with open(file_path, 'rb') as f:
-            signature = f.read(8)
+        source may be a path, the file's bytes, or a binary file object
+        (read from its current position, which is restored afterwards), so
+        in-memory uploads can be checked without writing them to disk.
+        
+        Results for paths are cached per (path, mtime, size), so calling
+        several ExcelProcessor methods on an unchanged file reads its
+        signature once.
+        """
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            detected = _match_signature(bytes(source[:8]))
+            if detected:
+                return detected
+            raise ValueError("Unknown Excel format for in-memory data")
         
-        # XLSX/XLSM are ZIP archives
-        if signature.startswith(b'PK\x03\x04'):
-            return 'xlsx'
+        if hasattr(source, 'read'):
+            position = source.tell()
+            signature = source.read(8)
+            source.seek(position)
+            
+            name = getattr(source, 'name', None)
+            detected = _match_signature(signature) or (
+                _format_from_extension(name) if isinstance(name, str) else None
+            )
+            if detected:
+                return detected
+            raise ValueError(f"Unknown Excel format for {name or 'file object'}")
         
-        # XLS has OLE/CFB signature
-        if signature.startswith(b'\xD0\xCF\x11\xE0\xA1\xB1\x1A\xE1'):
-            return 'xls'
+        file_path = source
+        stat = os.stat(file_path)
+        return ExcelProcessor._detect_format_cached(
+            os.fspath(file_path), stat.st_mtime_ns, stat.st_size
+        )
+    
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _detect_format_cached(file_path: str, mtime_ns: int, size: int) -> str:
+        """Signature sniffing behind detect_excel_format (mtime/size only key the cache)"""
         
-        # Fallback to extension
-        ext = os.path.splitext(file_path)[1].lower()
-        if ext in ['.xls', '.xlsx', '.xlsm']:
-            return ext[1:]  # Remove dot
+        with open(file_path, 'rb') as f:
+            signature = f.read(8)
+        
+        # Signature first, falling back to extension
+        detected = _match_signature(signature) or _format_from_extension(file_path)
+        if detected:
+            return detected
         
         raise ValueError(f"Unknown Excel format for {file_path}")
     
     @staticmethod
     def read_excel_auto(
         file_path: str,
-        sheet_name: Optional[Union[str, int]] = 0
+        sheet_name: Optional[Union[str, int]] = 0,
+        format_hint: Optional[str] = None
     ) -> pd.DataFrame:
         """
         Automatically detect format and use correct engine
@@ -43,12 +105,14 @@ class ExcelProcessor:
         Args:
             file_path: Path to Excel file
             sheet_name: Sheet name or index to read (default: first sheet)
+            format_hint: Format already returned by detect_excel_format, to skip detection
         
         Returns:
             pandas DataFrame with Excel data
         """
+        import pandas as pd
         
-        format_type = ExcelProcessor.detect_excel_format(file_path)
+        format_type = format_hint or ExcelProcessor.detect_excel_format(file_path)
         
         print(f"Detected Excel format: {format_type}")
         
@@ -92,10 +156,86 @@ class ExcelProcessor:
         return df
     
     @staticmethod
-    def get_excel_metadata(file_path: str) -> Dict[str, Any]:
+    def read_excel_fast(
+        file_path: str,
+        sheet_name: Union[str, int] = 0,
+        max_rows: Optional[int] = None,
+        format_hint: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Read a sheet (or its first max_rows data rows) with minimal overhead
+        
+        XLSX/XLSM rows are streamed from openpyxl's read-only mode as plain
+        values, so no Cell objects are built and reading stops after
+        max_rows. The first row becomes the header, as in read_excel_auto.
+        XLS files still go through xlrd.
+        
+        Args:
+            file_path: Path to Excel file
+            sheet_name: Sheet name or index to read (default: first sheet)
+            max_rows: Maximum number of data rows to read (default: all)
+            format_hint: Format already returned by detect_excel_format, to skip detection
+        
+        Returns:
+            pandas DataFrame with Excel data
+        """
+        import pandas as pd
+        
+        format_type = format_hint or ExcelProcessor.detect_excel_format(file_path)
+        
+        if format_type == 'xls':
+            try:
+                df = pd.read_excel(
+                    file_path,
+                    sheet_name=sheet_name,
+                    engine='xlrd',
+                    nrows=max_rows
+                )
+            except ImportError:
+                raise ImportError(
+                    "xlrd library required for .xls files. "
+                    "Install with: pip install xlrd==2.0.1"
+                )
+        
+        elif format_type in ['xlsx', 'xlsm']:
+            try:
+                from openpyxl import load_workbook
+            except ImportError:
+                raise ImportError(
+                    "openpyxl library required for .xlsx files. "
+                    "Install with: pip install openpyxl"
+                )
+            
+            workbook = load_workbook(file_path, read_only=True, data_only=True)
+            try:
+                if isinstance(sheet_name, str):
+                    worksheet = workbook[sheet_name]
+                else:
+                    worksheet = workbook.worksheets[sheet_name]
+                
+                # Header row plus up to max_rows data rows
+                limit = None if max_rows is None else max_rows + 1
+                rows = list(islice(worksheet.iter_rows(values_only=True), limit))
+            finally:
+                workbook.close()
+            
+            df = pd.DataFrame(rows[1:], columns=rows[0]) if rows else pd.DataFrame()
+        
+        else:
+            raise ValueError(f"Unsupported Excel format: {format_type}")
+        
+        if df.empty:
+            raise ValueError(f"Excel file appears empty: {file_path}")
+        
+        print(f"✓ Read {format_type} file (fast path): {len(df)} rows")
+        
+        return df
+    
+    @staticmethod
+    def get_excel_metadata(file_path: str, format_hint: Optional[str] = None) -> Dict[str, Any]:
         """Get Excel file metadata without reading all data"""
         
-        format_type = ExcelProcessor.detect_excel_format(file_path)
+        format_type = format_hint or ExcelProcessor.detect_excel_format(file_path)
         
         metadata = {
             'file_path': file_path,
@@ -120,10 +260,11 @@ class ExcelProcessor:
         return metadata
     
     @staticmethod
-    def read_all_sheets(file_path: str) -> Dict[str, pd.DataFrame]:
+    def read_all_sheets(file_path: str, format_hint: Optional[str] = None) -> Dict[str, pd.DataFrame]:
         """Read all sheets from Excel file"""
+        import pandas as pd
         
-        format_type = ExcelProcessor.detect_excel_format(file_path)
+        format_type = format_hint or ExcelProcessor.detect_excel_format(file_path)
         
         engine = 'xlrd' if format_type == 'xls' else 'openpyxl'
         
@@ -153,7 +294,7 @@ if __name__ == "__main__":
         print(f"\nMetadata: {metadata}")
         
         # Read first sheet
-        df = ExcelProcessor.read_excel_auto(test_file)
+        df = ExcelProcessor.read_excel_auto(test_file, format_hint=metadata['format'])
         print(f"\nFirst sheet preview:")
         print(df.head())
         
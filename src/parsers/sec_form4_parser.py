@@ -3,10 +3,204 @@ SEC Form 4 XML Parser
 Handles SEC EDGAR Ownership XML Technical Specification v1-v5
 """
 
+import asyncio
+import copy
+import threading
+import time
 import xml.etree.ElementTree as ET
-from typing import Dict, List, Any
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from io import BytesIO
+from typing import Dict, Any, List, Optional
 import requests
-from datetime import datetime
+from requests.adapters import HTTPAdapter
+from datetime import datetime, timezone
+
+# Streaming XML parser for large filings (falls back to ElementTree)
+try:
+    from lxml import etree as lxml_etree
+    LXML_AVAILABLE = True
+    XML_PARSE_ERRORS = (ET.ParseError, lxml_etree.XMLSyntaxError)
+except ImportError:
+    LXML_AVAILABLE = False
+    XML_PARSE_ERRORS = (ET.ParseError,)
+
+# Async HTTP client for bulk fetches (falls back to worker threads)
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+# Leading bytes that settle a document's format on their own
+FORMAT_SIGNATURES = {
+    b'<?xm': 'XML',
+    b'%PDF': 'PDF',
+    b'<HTM': 'HTML',
+}
+
+# Elements parse_form4_xml extracts data from
+FORM4_ELEMENTS = ('issuer', 'reportingOwner', 'nonDerivativeTransaction', 'derivativeTransaction')
+
+# Transaction fields as (result key, path below the transaction element).
+# parse_form4_xml prefixes these with the document namespace once per parse.
+NON_DERIVATIVE_FIELDS = (
+    ('security_title', 'securityTitle/value'),
+    ('transaction_date', 'transactionDate/value'),
+    ('transaction_code', 'transactionCoding/transactionCode'),
+    ('transaction_form_type', 'transactionCoding/transactionFormType'),
+    ('shares', 'transactionAmounts/transactionShares/value'),
+    ('price_per_share', 'transactionAmounts/transactionPricePerShare/value'),
+    ('acquired_disposed', 'transactionAmounts/transactionAcquiredDisposedCode/value'),
+    ('shares_owned_following', 'postTransactionAmounts/sharesOwnedFollowingTransaction/value'),
+    ('ownership_form', 'ownershipNature/directOrIndirectOwnership/value'),
+)
+
+DERIVATIVE_FIELDS = (
+    ('security_title', 'securityTitle/value'),
+    ('conversion_price', 'conversionOrExercisePrice/value'),
+    ('transaction_date', 'transactionDate/value'),
+    ('transaction_code', 'transactionCoding/transactionCode'),
+    ('shares', 'transactionAmounts/transactionShares/value'),
+    ('underlying_security_title', 'underlyingSecurity/underlyingSecurityTitle/value'),
+    ('underlying_shares', 'underlyingSecurity/underlyingSecurityShares/value'),
+)
+
+
+def _build_queries(fields) -> tuple:
+    """Turn a field table into (key, descendant query) pairs"""
+    return tuple((key, f'.//{path}') for key, path in fields)
+
+
+# Namespaces are stripped while parsing, so the queries are plain constants
+NON_DERIVATIVE_QUERIES = _build_queries(NON_DERIVATIVE_FIELDS)
+DERIVATIVE_QUERIES = _build_queries(DERIVATIVE_FIELDS)
+ISSUER_QUERIES = _build_queries((
+    ('cik', 'issuerCik'),
+    ('name', 'issuerName'),
+    ('trading_symbol', 'issuerTradingSymbol'),
+))
+OWNER_QUERIES = _build_queries((
+    ('cik', 'reportingOwnerId/rptOwnerCik'),
+    ('name', 'reportingOwnerId/rptOwnerName'),
+))
+# Relationship flags are true when the element text is '1'
+RELATIONSHIP_FLAG_QUERIES = _build_queries((
+    ('is_director', 'reportingOwnerRelationship/isDirector'),
+    ('is_officer', 'reportingOwnerRelationship/isOfficer'),
+    ('is_ten_percent_owner', 'reportingOwnerRelationship/isTenPercentOwner'),
+))
+OFFICER_TITLE_QUERY = './/reportingOwnerRelationship/officerTitle'
+
+
+def _texts(elem, queries) -> list:
+    """Text of the first match for each (key, query) pair, '' if missing"""
+    return [found.text if (found := elem.find(query)) is not None else '' for _, query in queries]
+
+
+def _text_fields(elem, queries) -> Dict[str, Any]:
+    """{key: text} for each (key, query) pair, '' if missing"""
+    return {key: found.text if (found := elem.find(query)) is not None else '' for key, query in queries}
+
+
+def _strip_namespaces(element):
+    """Drop the '{namespace}' prefix from element and every element below it"""
+    for el in element.iter():
+        tag = el.tag
+        if isinstance(tag, str) and tag[:1] == '{':
+            el.tag = tag.rsplit('}', 1)[-1]
+
+
+class Form4Transaction:
+    """
+    Compact record for one Form 4 transaction
+    
+    Returned by parse_form4_xml(..., as_objects=True) in place of dicts.
+    __slots__ gives every row a fixed attribute layout, which keeps filings
+    with thousands of transactions small; to_dict() produces the dict form
+    used in the default output.
+    """
+    __slots__ = ()
+    TYPE = ''
+    
+    def __init__(self, *values):
+        for key, value in zip(self.__slots__, values):
+            setattr(self, key, value)
+    
+    @property
+    def type(self) -> str:
+        return self.TYPE
+    
+    def to_dict(self) -> Dict[str, Any]:
+        result = {'type': self.TYPE}
+        for key in self.__slots__:
+            result[key] = getattr(self, key)
+        return result
+    
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.to_dict()!r})"
+
+
+class NonDerivativeTransaction(Form4Transaction):
+    __slots__ = tuple(key for key, _ in NON_DERIVATIVE_FIELDS)
+    TYPE = 'non_derivative'
+
+
+class DerivativeTransaction(Form4Transaction):
+    __slots__ = tuple(key for key, _ in DERIVATIVE_FIELDS)
+    TYPE = 'derivative'
+
+
+def _extract_transaction(elem, record_cls, queries, as_objects: bool):
+    """Read one transaction element into record_cls, or its dict form"""
+    texts = _texts(elem, queries)
+    
+    if as_objects:
+        return record_cls(*texts)
+    
+    transaction = {'type': record_cls.TYPE}
+    transaction.update(zip(record_cls.__slots__, texts))
+    return transaction
+
+
+class RateLimiter:
+    """
+    Keep requests at least `interval` seconds apart across all threads
+    
+    Each caller reserves the next free slot under the lock and sleeps
+    outside it. Concurrent fetches queue at the allowed rate, and a lone
+    request does not pay a fixed delay on top of its own round trip.
+    """
+    
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+    
+    def _reserve(self) -> float:
+        """Claim the next slot and return how long to wait for it"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        return slot - now
+    
+    def wait(self):
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+    
+    async def wait_async(self):
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+    
+    def defer(self, seconds: float):
+        """Hold every caller's next slot back at least `seconds` (e.g. Retry-After)"""
+        with self._lock:
+            self._next_slot = max(self._next_slot, time.monotonic() + seconds)
+
 
 class SECForm4Parser:
     """Parser for SEC Form 4 XML documents"""
@@ -14,6 +208,23 @@ class SECForm4Parser:
     # SEC rate limit: 10 requests per second maximum
     RATE_LIMIT_DELAY = 0.11  # 110ms between requests
     
+    # Retries for throttled or failing fetches; every attempt goes through
+    # the rate limiter, and a Retry-After reply holds back all fetches
+    MAX_RETRIES = 3
+    RETRY_BACKOFF = 0.5  # seconds, doubled per attempt
+    RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+    MAX_RETRY_AFTER = 60.0
+    
+    # Parses kept for conditional GETs (If-None-Match / If-Modified-Since)
+    CONDITIONAL_CACHE_SIZE = 512
+    
+    # Shared by all parser instances: one connection pool, one rate budget
+    _session = None
+    _session_lock = threading.Lock()
+    _rate_limiter = RateLimiter(RATE_LIMIT_DELAY)
+    _conditional_cache = OrderedDict()  # url -> (etag, last_modified, result)
+    _conditional_lock = threading.Lock()
+    
     # SEC requires User-Agent header with company name and email
     HEADERS = {
         "User-Agent": "NITS System admin@company.com",
@@ -28,104 +239,83 @@ class SECForm4Parser:
         if url.endswith('.xml') or 'ownership' in url.lower():
             return 'XML'
         
-        # Check content signatures
-        if content.startswith(b'<?xml') or b'<ownershipDocument>' in content[:1000]:
+        # Check content signatures: one lookup on the first four bytes
+        format_type = FORMAT_SIGNATURES.get(content[:4])
+        if format_type:
+            return format_type
+        
+        # Inconclusive prefix - look further into the document
+        if b'<ownershipDocument>' in content[:1000]:
             return 'XML'
-        elif content.startswith(b'%PDF'):
-            return 'PDF'
-        elif content.startswith(b'<HTML') or b'<!DOCTYPE html>' in content[:500]:
+        elif b'<!DOCTYPE html>' in content[:500]:
             return 'HTML'
         
         return 'UNKNOWN'
     
-    def parse_form4_xml(self, xml_content: bytes) -> Dict[str, Any]:
+    def parse_form4_xml(self, xml_content: bytes, as_objects: bool = False) -> Dict[str, Any]:
         """
         Parse SEC Form 4 XML per EDGAR Ownership XML Technical Specification
         Supports schema versions v1 through v5
+        
+        The issuer, owner and transaction elements are visited in document
+        order by _iter_form4_elements, which streams the filing when lxml
+        is installed.
+        
+        With as_objects=True the transactions are returned as
+        Form4Transaction records instead of dicts (call to_dict() on each
+        before JSON serialization).
         """
         
+        root = None
+        issuer = None
+        reporting_owners = []
+        non_derivative = []
+        derivative = []
+        
         try:
-            root = ET.fromstring(xml_content)
-        except ET.ParseError as e:
+            for root, elem in self._iter_form4_elements(xml_content):
+                if elem is None:
+                    break
+                
+                tag = elem.tag
+                
+                # Extract issuer information (first issuer element)
+                if tag == 'issuer':
+                    if issuer is None:
+                        issuer = _text_fields(elem, ISSUER_QUERIES)
+                
+                # Extract reporting owner information
+                elif tag == 'reportingOwner':
+                    owner = _text_fields(elem, OWNER_QUERIES)
+                    flags = _text_fields(elem, RELATIONSHIP_FLAG_QUERIES)
+                    relationship = {key: text == '1' for key, text in flags.items()}
+                    title = elem.find(OFFICER_TITLE_QUERY)
+                    relationship['officer_title'] = title.text if title is not None else ''
+                    owner['relationship'] = relationship
+                    reporting_owners.append(owner)
+                
+                # Extract non-derivative transactions
+                elif tag == 'nonDerivativeTransaction':
+                    non_derivative.append(_extract_transaction(
+                        elem, NonDerivativeTransaction, NON_DERIVATIVE_QUERIES, as_objects
+                    ))
+                
+                # Extract derivative transactions
+                else:
+                    derivative.append(_extract_transaction(
+                        elem, DerivativeTransaction, DERIVATIVE_QUERIES, as_objects
+                    ))
+        except XML_PARSE_ERRORS as e:
             raise ValueError(f"Invalid XML content: {e}")
         
-        # Extract namespace if present
-        namespace = ''
-        if '}' in root.tag:
-            namespace = root.tag.split('}')[0] + '}'
-        
-        # Helper function for namespace-aware searches
-        def find_text(element, path, default=''):
-            """Find element and return text, handling namespaces"""
-            try:
-                found = element.find(f'.//{namespace}{path}')
-                return found.text if found is not None else default
-            except:
-                return default
-        
         # Parse document header
         schemaVersion = root.attrib.get('schemaVersion', 'unknown')
         
-        # Extract issuer information
-        issuer = {
-            'cik': find_text(root, 'issuer/issuerCik'),
-            'name': find_text(root, 'issuer/issuerName'),
-            'trading_symbol': find_text(root, 'issuer/issuerTradingSymbol')
-        }
+        if issuer is None:
+            issuer = {'cik': '', 'name': '', 'trading_symbol': ''}
         
-        # Extract reporting owner information
-        reporting_owners = []
-        for owner_elem in root.findall(f'.//{namespace}reportingOwner'):
-            owner = {
-                'cik': find_text(owner_elem, 'reportingOwnerId/rptOwnerCik'),
-                'name': find_text(owner_elem, 'reportingOwnerId/rptOwnerName'),
-                'relationship': {
-                    'is_director': find_text(owner_elem, 'reportingOwnerRelationship/isDirector') == '1',
-                    'is_officer': find_text(owner_elem, 'reportingOwnerRelationship/isOfficer') == '1',
-                    'is_ten_percent_owner': find_text(owner_elem, 'reportingOwnerRelationship/isTenPercentOwner') == '1',
-                    'officer_title': find_text(owner_elem, 'reportingOwnerRelationship/officerTitle')
-                }
-            }
-            reporting_owners.append(owner)
-        
-        # Extract non-derivative transactions
-        transactions = []
-        for trans_elem in root.findall(f'.//{namespace}nonDerivativeTransaction'):
-            try:
-                transaction = {
-                    'type': 'non_derivative',
-                    'security_title': find_text(trans_elem, 'securityTitle/value'),
-                    'transaction_date': find_text(trans_elem, 'transactionDate/value'),
-                    'transaction_code': find_text(trans_elem, 'transactionCoding/transactionCode'),
-                    'transaction_form_type': find_text(trans_elem, 'transactionCoding/transactionFormType'),
-                    'shares': find_text(trans_elem, 'transactionAmounts/transactionShares/value'),
-                    'price_per_share': find_text(trans_elem, 'transactionAmounts/transactionPricePerShare/value'),
-                    'acquired_disposed': find_text(trans_elem, 'transactionAmounts/transactionAcquiredDisposedCode/value'),
-                    'shares_owned_following': find_text(trans_elem, 'postTransactionAmounts/sharesOwnedFollowingTransaction/value'),
-                    'ownership_form': find_text(trans_elem, 'ownershipNature/directOrIndirectOwnership/value')
-                }
-                transactions.append(transaction)
-            except Exception as e:
-                print(f"Warning: Failed to parse transaction: {e}")
-                continue
-        
-        # Extract derivative transactions
-        for trans_elem in root.findall(f'.//{namespace}derivativeTransaction'):
-            try:
-                transaction = {
-                    'type': 'derivative',
-                    'security_title': find_text(trans_elem, 'securityTitle/value'),
-                    'conversion_price': find_text(trans_elem, 'conversionOrExercisePrice/value'),
-                    'transaction_date': find_text(trans_elem, 'transactionDate/value'),
-                    'transaction_code': find_text(trans_elem, 'transactionCoding/transactionCode'),
-                    'shares': find_text(trans_elem, 'transactionAmounts/transactionShares/value'),
-                    'underlying_security_title': find_text(trans_elem, 'underlyingSecurity/underlyingSecurityTitle/value'),
-                    'underlying_shares': find_text(trans_elem, 'underlyingSecurity/underlyingSecurityShares/value')
-                }
-                transactions.append(transaction)
-            except Exception as e:
-                print(f"Warning: Failed to parse derivative transaction: {e}")
-                continue
+        # Non-derivative transactions first, then derivative ones
+        transactions = non_derivative + derivative
         
         # Compile complete result
         result = {
@@ -140,22 +330,225 @@ class SECForm4Parser:
         
         return result
     
+    def _iter_form4_elements(self, xml_content: bytes):
+        """
+        Yield (root, element) for every issuer, reportingOwner and transaction
+        element in document order, then a final (root, None)
+        
+        Yielded elements have their namespaces stripped, so callers can use
+        plain paths such as 'issuerCik'. EDGAR filings normally carry no
+        namespace, and then nothing is rewritten.
+        
+        With lxml the filing is parsed incrementally: once the caller moves
+        on, each element is cleared and its processed siblings are dropped,
+        so only the element in hand is kept in memory. Without lxml the whole
+        tree is built with ElementTree and walked instead.
+        """
+        if LXML_AVAILABLE:
+            context = lxml_etree.iterparse(
+                BytesIO(xml_content),
+                events=('end',),
+                tag=tuple('{*}' + name for name in FORM4_ELEMENTS),
+                resolve_entities=False
+            )
+            root = None
+            for _, elem in context:
+                if root is None:
+                    root = elem.getroottree().getroot()
+                    namespaced = root.tag[:1] == '{'
+                if namespaced:
+                    _strip_namespaces(elem)
+                yield root, elem
+                
+                elem.clear(keep_tail=True)
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+            yield context.root, None
+        else:
+            root = ET.fromstring(xml_content)
+            if root.tag[:1] == '{':
+                _strip_namespaces(root)
+            for elem in root.iter():
+                if elem.tag in FORM4_ELEMENTS:
+                    yield root, elem
+            yield root, None
+    
+    @classmethod
+    def _get_session(cls) -> requests.Session:
+        """Shared keep-alive session so repeat fetches skip the TCP/TLS handshake"""
+        with cls._session_lock:
+            if cls._session is None:
+                session = requests.Session()
+                session.headers.update(cls.HEADERS)
+                # Retries are done in fetch_and_parse, under the rate limiter
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                cls._session = session
+            return cls._session
+    
     def fetch_and_parse(self, url: str) -> Dict[str, Any]:
-        """Fetch SEC document from URL and parse it"""
+        """
+        Fetch SEC document from URL and parse it
         
-        import time
-        time.sleep(self.RATE_LIMIT_DELAY)  # Respect rate limits
+        A URL fetched before is requested conditionally, and a 304 reply
+        returns the earlier parse without downloading the body again.
+        """
+        
+        headers, cached = self._conditional_request(url)
+        session = self._get_session()
+        
+        for attempt in range(self.MAX_RETRIES + 1):
+            self._rate_limiter.wait()  # Respect rate limits
+            
+            try:
+                response = session.get(url, headers=headers, timeout=30)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt == self.MAX_RETRIES:
+                    raise
+                time.sleep(self.RETRY_BACKOFF * 2 ** attempt)
+                continue
+            
+            if response.status_code not in self.RETRY_STATUSES or attempt == self.MAX_RETRIES:
+                break
+            time.sleep(self._retry_delay(response.headers, attempt))
         
-        response = requests.get(url, headers=self.HEADERS, timeout=30)
+        if response.status_code == 304 and cached is not None:
+            return self._from_cache(cached)
         response.raise_for_status()
         
-        content = response.content
+        return self._parse_fetched(url, response.content, response.headers)
+    
+    async def fetch_and_parse_many(self, urls: List[str]) -> List[Any]:
+        """
+        Fetch and parse many SEC documents concurrently
+        
+        Requests overlap but share the parser's rate limiter, so a bulk
+        pull runs at SEC's 10 req/s cap instead of one round trip at a
+        time. Results come back in the order of urls; a failed fetch leaves
+        its exception in that slot rather than aborting the batch.
+        
+        Uses aiohttp when installed, otherwise runs fetch_and_parse in
+        worker threads.
+        """
+        if not AIOHTTP_AVAILABLE:
+            loop = asyncio.get_running_loop()
+            with ThreadPoolExecutor(max_workers=10) as pool:
+                return await asyncio.gather(
+                    *(loop.run_in_executor(pool, self.fetch_and_parse, url) for url in urls),
+                    return_exceptions=True
+                )
+        
+        async with aiohttp.ClientSession(
+            headers=self.HEADERS,
+            connector=aiohttp.TCPConnector(limit=10),
+            timeout=aiohttp.ClientTimeout(total=30)
+        ) as session:
+            return await asyncio.gather(
+                *(self._fetch_one(session, url) for url in urls),
+                return_exceptions=True
+            )
+    
+    async def _fetch_one(self, session, url: str) -> Dict[str, Any]:
+        """aiohttp counterpart of fetch_and_parse"""
+        headers, cached = self._conditional_request(url)
+        
+        for attempt in range(self.MAX_RETRIES + 1):
+            await self._rate_limiter.wait_async()
+            
+            try:
+                async with session.get(url, headers=headers) as response:
+                    if response.status in self.RETRY_STATUSES and attempt < self.MAX_RETRIES:
+                        delay = self._retry_delay(response.headers, attempt)
+                    else:
+                        if response.status == 304 and cached is not None:
+                            return self._from_cache(cached)
+                        response.raise_for_status()
+                        content = await response.read()
+                        break
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt == self.MAX_RETRIES:
+                    raise
+                delay = self.RETRY_BACKOFF * 2 ** attempt
+            await asyncio.sleep(delay)
+        
+        return self._parse_fetched(url, content, response.headers)
+    
+    def _retry_delay(self, response_headers, attempt: int) -> float:
+        """
+        Seconds to wait before retrying a throttled/failed response
+        A Retry-After header also defers the shared rate limiter, so other
+        fetches back off too instead of bursting past SEC's limit
+        """
+        retry_after = self._parse_retry_after(response_headers.get('Retry-After'))
+        if retry_after is None:
+            return self.RETRY_BACKOFF * 2 ** attempt
+        
+        self._rate_limiter.defer(retry_after)
+        return retry_after
+    
+    def _parse_retry_after(self, value: Optional[str]) -> Optional[float]:
+        """Retry-After as seconds (delta-seconds or HTTP-date), capped at MAX_RETRY_AFTER"""
+        if not value:
+            return None
+        try:
+            seconds = float(value)
+        except ValueError:
+            try:
+                when = parsedate_to_datetime(value)
+            except (TypeError, ValueError):
+                return None
+            if when.tzinfo is None:
+                when = when.replace(tzinfo=timezone.utc)
+            seconds = (when - datetime.now(timezone.utc)).total_seconds()
+        return min(max(seconds, 0.0), self.MAX_RETRY_AFTER)
+    
+    def _conditional_request(self, url: str):
+        """Return (extra headers, cached entry or None) for fetching url"""
+        with self._conditional_lock:
+            cached = self._conditional_cache.get(url)
+        
+        headers = {}
+        if cached is not None:
+            etag, last_modified, _ = cached
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+        return headers, cached
+    
+    def _from_cache(self, cached) -> Dict[str, Any]:
+        """
+        A 304 reply's result: a private copy of the cached parse, stamped
+        with a fresh parsed_at, so no caller can change what later hits get
+        """
+        return {**copy.deepcopy(cached[2]), 'parsed_at': datetime.utcnow().isoformat()}
+    
+    def _parse_fetched(self, url: str, content: bytes, response_headers) -> Dict[str, Any]:
+        """Parse a downloaded document and keep it for conditional GETs"""
         format_type = self.detect_format(url, content)
         
         if format_type == 'XML':
-            return self.parse_form4_xml(content)
+            result = self.parse_form4_xml(content)
+            self._remember(url, response_headers, result)
+            return result
         else:
             raise ValueError(f"Unsupported SEC document format: {format_type}")
+    
+    def _remember(self, url: str, response_headers, result: Dict[str, Any]):
+        """Keep a parse for later conditional GETs if the server sent validators"""
+        etag = response_headers.get('ETag')
+        last_modified = response_headers.get('Last-Modified')
+        if not (etag or last_modified):
+            return
+        
+        # Cache a copy: the caller is free to modify the result it gets
+        result = copy.deepcopy(result)
+        with self._conditional_lock:
+            self._conditional_cache[url] = (etag, last_modified, result)
+            self._conditional_cache.move_to_end(url)
+            while len(self._conditional_cache) > self.CONDITIONAL_CACHE_SIZE:
+                self._conditional_cache.popitem(last=False)
 
 
 # Quick test function
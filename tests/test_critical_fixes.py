@@ -0,0 +1,184 @@
+"""
+Tests for the batch keyword matching in critical_fixes.FixedNITSAnalyzer
+The batch paths (_batch_fuzzy_match / analyze_sec_documents_batch) must
+report exactly what fuzzy_match_with_negation_detection finds per keyword
+"""
+
+import dataclasses
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+pytest.importorskip('rapidfuzz')
+pytest.importorskip('numpy')
+
+import critical_fixes
+from critical_fixes import FixedNITSAnalyzer, Violation, build_sample_dossier
+
+DOCUMENTS = [
+    # Plain exact hits
+    "The filing contained fraud and misleading statements about revenue.",
+    # Negated exact hit (fraud) next to non-negated ones
+    "There was no fraud in the report, but hazardous waste and pollution followed.",
+    # Fuzzy hits, one of them negated (never ... hazardus)
+    "Evidence of decepttive practices and pollutoin; the plant was never hazardus again.",
+    # Nothing to find
+    "Quarterly results were in line with guidance.",
+]
+
+@pytest.fixture(scope="module")
+def analyzer():
+    return FixedNITSAnalyzer.from_dossier(build_sample_dossier())
+
+def expected_hits(analyzer, text):
+    """(keyword, position, matched text, score) per dossier entry, one keyword at a time"""
+    hits = []
+    for keyword, targets in zip(analyzer._unique_keywords, analyzer._keyword_targets):
+        for match in analyzer.fuzzy_match_with_negation_detection(keyword, text):
+            for _ in targets:
+                hits.append((keyword, match['position'], match['matched_text'], round(match['score'], 6)))
+    return sorted(hits)
+
+def result_hits(result):
+    return sorted(
+        (v.keywords[0], v.location['position'], v.extracted_text, round(v.confidence * 100, 6))
+        for v in result.violations
+    )
+
+class TestBatchMatchingParity:
+    
+    def test_documents_exercise_negation(self, analyzer):
+        """The fixtures contain both negated and non-negated hits"""
+        matched = {hit[2].lower() for text in DOCUMENTS for hit in expected_hits(analyzer, text)}
+        assert {'fraud', 'hazardous', 'decepttive'} <= matched
+        assert 'hazardus' not in matched
+        
+        negated_doc = expected_hits(analyzer, DOCUMENTS[1])
+        assert all(hit[0] != 'fraud' for hit in negated_doc)
+    
+    def test_batch_fuzzy_match_matches_per_keyword(self, analyzer):
+        for text in DOCUMENTS:
+            batch = analyzer._batch_fuzzy_match(text)
+            for keyword, matches in zip(analyzer._unique_keywords, batch):
+                assert matches == analyzer.fuzzy_match_with_negation_detection(keyword, text)
+    
+    def test_analyze_batch_matches_per_keyword(self, analyzer):
+        names = [f"doc{i}" for i in range(len(DOCUMENTS))]
+        results = analyzer.analyze_sec_documents_batch(DOCUMENTS, names)
+        
+        for text, name, result in zip(DOCUMENTS, names, results):
+            assert result.document_name == name
+            assert result_hits(result) == expected_hits(analyzer, text)
+            assert result_hits(analyzer.analyze_sec_document(text, name)) == expected_hits(analyzer, text)
+    
+    def test_chunked_scoring_matches(self, analyzer, monkeypatch):
+        """Chunk boundaries (inside and across documents) do not change the hits"""
+        monkeypatch.setattr(critical_fixes, 'FUZZY_CHUNK_WORDS', 3)
+        results = analyzer.analyze_sec_documents_batch(DOCUMENTS, ['doc'] * len(DOCUMENTS))
+        
+        for text, result in zip(DOCUMENTS, results):
+            assert result_hits(result) == expected_hits(analyzer, text)
+
+# "fraud" only occurs inside longer words here
+EMBEDDED_FRAUD = [
+    "The fraudulent filing was withdrawn.",
+    "The defrauded party filed suit.",
+]
+
+class TestWholeWordExactHits:
+    
+    @pytest.mark.parametrize('text', EMBEDDED_FRAUD)
+    def test_keyword_inside_longer_word_is_not_a_hit(self, analyzer, text):
+        assert analyzer.fuzzy_match_with_negation_detection('fraud', text) == []
+    
+    @pytest.mark.parametrize('text', EMBEDDED_FRAUD)
+    def test_batch_paths_skip_keyword_inside_longer_word(self, analyzer, text):
+        fraud = analyzer._unique_keywords.index('fraud')
+        assert analyzer._find_keyword_spans(text)[fraud] == []
+        assert analyzer._batch_fuzzy_match(text)[fraud] == []
+        
+        result = analyzer.analyze_sec_document(text, 'doc')
+        assert all(v.keywords[0] != 'fraud' for v in result.violations)
+    
+    def test_scanners_agree(self):
+        """The automaton and the regex fallback report the same spans"""
+        pytest.importorskip('ahocorasick')
+        dossier = [{
+            'category': 'Test', 'regulation': 'Test', 'severity': 50,
+            'keywords': ['aa aa', 'fraud', 'ab']
+        }]
+        analyzer = FixedNITSAnalyzer.from_dossier(dossier)
+        text = "aa aa aa aa, fraud_x fraud ab-ab abab"
+        
+        spans = analyzer._find_keyword_spans(text)
+        analyzer.automaton = None
+        assert analyzer._find_keyword_spans(text) == spans
+        assert spans == [[(0, 5), (6, 11)], [(21, 26)], [(27, 29), (30, 32)]]
+    
+    def test_whole_word_is_an_exact_hit(self, analyzer):
+        matches = analyzer.fuzzy_match_with_negation_detection('fraud', "Fraud, plainly.")
+        assert matches == [{'position': 0, 'matched_text': 'Fraud', 'score': 100}]
+
+class TestTyposNextToExactHits:
+    
+    TEXT = "Reported pollution near the river; the polution spread downstream."
+    
+    def test_typo_found_alongside_exact_hit(self, analyzer):
+        matches = analyzer.fuzzy_match_with_negation_detection('pollution', self.TEXT)
+        assert [m['matched_text'] for m in matches] == ['pollution', 'polution']
+        assert matches[0]['score'] == 100 and matches[1]['score'] < 100
+    
+    def test_batch_paths_find_typo(self, analyzer):
+        pollution = analyzer._unique_keywords.index('pollution')
+        assert analyzer._batch_fuzzy_match(self.TEXT)[pollution] == \
+            analyzer.fuzzy_match_with_negation_detection('pollution', self.TEXT)
+        
+        for result in (
+            analyzer.analyze_sec_document(self.TEXT, 'doc'),
+            analyzer.analyze_sec_documents_batch([self.TEXT], ['doc'])[0],
+        ):
+            found = {(v.category, v.extracted_text, v.location['position']) for v in result.violations}
+            assert ('Environmental Compliance', 'polution', self.TEXT.index('polution')) in found
+    
+    def test_short_keyword_skips_fuzzy_after_exact_hit(self, analyzer):
+        text = "Fraud here and frauds there."
+        assert [m['matched_text'] for m in analyzer.fuzzy_match_with_negation_detection('fraud', text)] == ['Fraud']
+
+class TestAnalysisResult:
+    
+    def test_asdict_json_round_trip(self, analyzer):
+        result = analyzer.analyze_sec_document(DOCUMENTS[0], 'doc0')
+        assert result.violations
+        
+        payload = json.loads(json.dumps(dataclasses.asdict(result)))
+        assert payload['document_name'] == 'doc0'
+        assert payload['total_violations'] == len(result.violations)
+        assert [Violation(**v) for v in payload['violations']] == result.violations
+    
+    def test_violations_is_a_list(self, analyzer):
+        result = analyzer.analyze_sec_document(DOCUMENTS[0], 'doc0')
+        assert isinstance(result.violations, list)
+        assert result.violations == list(result.violations)
+        
+        extra = result.violations[0]
+        result.violations.append(extra)
+        assert result.violations[-1] is extra
+
+class TestBatchProcessDocuments:
+    
+    def test_results_sorted_by_document_name(self, analyzer, tmp_path):
+        docs = tmp_path / 'docs'
+        docs.mkdir()
+        # Sizes run opposite to names, so processing order differs from report order
+        for i, name in enumerate(['c.txt', 'a.txt', 'b.txt', 'd.txt']):
+            (docs / name).write_text(DOCUMENTS[0] * (4 - i), encoding='utf-8')
+        
+        summary = analyzer.batch_process_documents(str(docs), str(tmp_path / 'out'), max_workers=2)
+        
+        assert summary['total_processed'] == 4
+        assert [r.document_name for r in summary['results']] == ['a.txt', 'b.txt', 'c.txt', 'd.txt']
@@ -1,41 +1,30 @@
 """
 Integration tests for document processing system
 Tests all critical fixes: SEC XML parsing, Excel processing, PDF extraction, file integrity
+
+Requests go through Flask's test client against the ML service app
+in-process, so no server has to be running on localhost:5000.
 """
 
 import pytest
-import requests
 import hashlib
-import os
 import sys
-import tempfile
+from io import BytesIO
 from pathlib import Path
 
+try:
+    import xdist  # noqa: F401 - only probed so the runner can pass -n auto
+    XDIST_AVAILABLE = True
+except ImportError:
+    XDIST_AVAILABLE = False
+
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-FLASK_URL = "http://localhost:5000/api/process"
+PROCESS_PATH = "/api/process"
 
-class TestDocumentProcessing:
-    
-    @classmethod
-    def setup_class(cls):
-        """Setup test class with sample documents"""
-        cls.test_files_created = []
-        
-    @classmethod
-    def teardown_class(cls):
-        """Clean up test files"""
-        for file_path in cls.test_files_created:
-            try:
-                os.unlink(file_path)
-            except:
-                pass
-    
-    def create_test_pdf(self) -> str:
-        """Create a minimal test PDF file"""
-        # Minimal PDF content
-        pdf_content = b"""%PDF-1.4
+# Minimal PDF content
+TEST_PDF_CONTENT = b"""%PDF-1.4
 1 0 obj
 << /Type /Catalog /Pages 2 0 R >>
 endobj
@@ -67,17 +56,9 @@ trailer
 startxref
 295
 %%EOF"""
-        
-        test_file = tempfile.NamedTemporaryFile(delete=False, suffix='.pdf')
-        test_file.write(pdf_content)
-        test_file.close()
-        
-        self.test_files_created.append(test_file.name)
-        return test_file.name
-    
-    def create_test_xml(self) -> str:
-        """Create a test SEC Form 4 XML file"""
-        xml_content = b'''<?xml version="1.0"?>
+
+# Test SEC Form 4 XML
+TEST_XML_CONTENT = b'''<?xml version="1.0"?>
 <ownershipDocument>
     <schemaVersion>X0306</schemaVersion>
     <documentType>4</documentType>
@@ -124,41 +105,46 @@ startxref
         </nonDerivativeTransaction>
     </nonDerivativeTable>
 </ownershipDocument>'''
-        
-        test_file = tempfile.NamedTemporaryFile(delete=False, suffix='.xml')
-        test_file.write(xml_content)
-        test_file.close()
-        
-        self.test_files_created.append(test_file.name)
-        return test_file.name
+
+@pytest.fixture(scope="session")
+def pdf_payload():
+    """Minimal test PDF bytes and their SHA-256, built once per session"""
+    return TEST_PDF_CONTENT, hashlib.sha256(TEST_PDF_CONTENT).hexdigest()
+
+@pytest.fixture(scope="session")
+def xml_payload():
+    """Test SEC Form 4 XML bytes and their SHA-256, built once per session"""
+    return TEST_XML_CONTENT, hashlib.sha256(TEST_XML_CONTENT).hexdigest()
+
+@pytest.fixture(scope="session")
+def client():
+    """Flask test client for the ML service app, called without sockets"""
+    sys.path.insert(0, str(Path(__file__).parent.parent / 'ml_service'))
+    main = pytest.importorskip('main', reason="ML service dependencies not installed")
+    main.app.config['TESTING'] = True
+    return main.app.test_client()
+
+class TestDocumentProcessing:
     
-    def test_flask_service_health(self):
+    def test_flask_service_health(self, client):
         """Test that Flask service is running"""
-        try:
-            response = requests.get("http://localhost:5000/health", timeout=5)
-            assert response.status_code == 200
-            print("✅ Flask service is running and healthy")
-        except requests.exceptions.RequestException as e:
-            pytest.skip(f"Flask service not available: {e}")
+        response = client.get("/health")
+        assert response.status_code == 200
+        print("✅ Flask service is running and healthy")
     
-    def test_pdf_extraction(self):
+    def test_pdf_extraction(self, client, pdf_payload):
         """Test PDF extraction with proper binary handling"""
-        test_pdf = self.create_test_pdf()
-        
-        with open(test_pdf, 'rb') as f:
-            pdf_data = f.read()
-            original_hash = hashlib.md5(pdf_data).hexdigest()
+        pdf_data, original_hash = pdf_payload
         
-        with open(test_pdf, 'rb') as f:
-            files = {'file': ('test.pdf', f, 'application/pdf')}
-            data = {'original_hash': original_hash}
-            response = requests.post(FLASK_URL, files=files, data=data, timeout=30)
+        files = {'file': (BytesIO(pdf_data), 'test.pdf', 'application/pdf')}
+        data = {'original_hash': original_hash}
+        response = client.post(PROCESS_PATH, data={**files, **data})
         
         print(f"PDF Response Status: {response.status_code}")
-        print(f"PDF Response: {response.text[:200]}...")
+        print(f"PDF Response: {response.get_data(as_text=True)[:200]}...")
         
         if response.status_code == 200:
-            result = response.json()
+            result = response.get_json()
             assert result['success'] == True
             assert 'result' in result
             assert result['result']['type'] == 'pdf'
@@ -170,44 +156,39 @@ startxref
             assert 'stream' not in text_preview[:100]
             print("✅ PDF extraction successful with clean output")
         else:
-            print(f"⚠️  PDF test failed: {response.status_code} - {response.text}")
+            print(f"⚠️  PDF test failed: {response.status_code} - {response.get_data(as_text=True)}")
             # Don't fail the test, just report
     
-    def test_sec_form4_xml(self):
+    def test_sec_form4_xml(self, client, xml_payload):
         """Test SEC Form 4 XML parsing"""
-        test_xml = self.create_test_xml()
-        
-        with open(test_xml, 'rb') as f:
-            xml_data = f.read()
-            original_hash = hashlib.md5(xml_data).hexdigest()
+        xml_data, original_hash = xml_payload
         
-        with open(test_xml, 'rb') as f:
-            files = {'file': ('test_form4.xml', f, 'text/xml')}
-            data = {'original_hash': original_hash}
-            response = requests.post(FLASK_URL, files=files, data=data, timeout=30)
+        files = {'file': (BytesIO(xml_data), 'test_form4.xml', 'text/xml')}
+        data = {'original_hash': original_hash}
+        response = client.post(PROCESS_PATH, data={**files, **data})
         
         print(f"XML Response Status: {response.status_code}")
-        print(f"XML Response: {response.text[:200]}...")
+        print(f"XML Response: {response.get_data(as_text=True)[:200]}...")
         
         if response.status_code == 200:
-            result = response.json()
+            result = response.get_json()
             assert result['success'] == True
             assert result['result']['type'] == 'sec_form4_xml'
             assert 'issuer' in result['result']
             assert result['result']['issuer'] == 'TEST COMPANY INC'
             print("✅ SEC Form 4 XML parsing successful")
         else:
-            print(f"⚠️  XML test failed: {response.status_code} - {response.text}")
+            print(f"⚠️  XML test failed: {response.status_code} - {response.get_data(as_text=True)}")
     
-    def test_file_integrity_validation(self):
+    def test_file_integrity_validation(self, client):
         """Test that file integrity is maintained during transfer"""
         test_data = b'Test file content for integrity validation'
-        original_hash = hashlib.md5(test_data).hexdigest()
+        original_hash = hashlib.sha256(test_data).hexdigest()
         
-        files = {'file': ('test.txt', test_data, 'text/plain')}
+        files = {'file': (BytesIO(test_data), 'test.txt', 'text/plain')}
         data = {'original_hash': original_hash}
         
-        response = requests.post(FLASK_URL, files=files, data=data, timeout=30)
+        response = client.post(PROCESS_PATH, data={**files, **data})
         
         print(f"Integrity Response Status: {response.status_code}")
         
@@ -215,98 +196,87 @@ startxref
         assert response.status_code in [200, 400]
         
         if response.status_code == 200:
-            result = response.json()
+            result = response.get_json()
             assert result['hash'] == original_hash
             print("✅ File integrity validation successful")
         else:
             # Unsupported format should give clear error
-            result = response.json()
+            result = response.get_json()
             assert 'error' in result
             print("✅ Unsupported format rejected correctly")
     
-    def test_binary_signature_validation(self):
+    def test_binary_signature_validation(self, client):
         """Test that file signatures are properly validated"""
         
         # Test fake PDF (wrong signature)
         fake_pdf = b'This is not a PDF file'
-        files = {'file': ('fake.pdf', fake_pdf, 'application/pdf')}
+        files = {'file': (BytesIO(fake_pdf), 'fake.pdf', 'application/pdf')}
         
-        response = requests.post(FLASK_URL, files=files, timeout=30)
+        response = client.post(PROCESS_PATH, data=files)
         
         print(f"Fake PDF Response: {response.status_code}")
         
         # Should reject files with wrong signatures
         if response.status_code == 400:
-            result = response.json()
+            result = response.get_json()
             assert 'signature' in result.get('error', '').lower() or 'format' in result.get('error', '').lower()
             print("✅ Invalid file signature correctly rejected")
         else:
             print("⚠️  File signature validation may need improvement")
     
-    def test_error_handling(self):
+    def test_error_handling(self, client):
         """Test error handling for various failure scenarios"""
         
         # Test empty file upload
-        response = requests.post(FLASK_URL, files={}, timeout=30)
+        response = client.post(PROCESS_PATH, data={})
         assert response.status_code == 400
-        result = response.json()
+        result = response.get_json()
         assert 'error' in result
         print("✅ Empty file upload properly rejected")
         
         # Test file without name
-        files = {'file': ('', b'', 'text/plain')}
-        response = requests.post(FLASK_URL, files=files, timeout=30)
+        files = {'file': (BytesIO(b''), '', 'text/plain')}
+        response = client.post(PROCESS_PATH, data=files)
         assert response.status_code == 400
         print("✅ File without name properly rejected")
+    
+    def test_entity_extraction_money_before_date(self, client):
+        """A money amount followed by a month name keeps both entities"""
+        response = client.post('/extract_entities', json={'text': 'Paid $5 March 3, 2024 and $2 M later'})
+        assert response.status_code == 200
+        entities = response.get_json()['entities']
+        
+        money = [e for e in entities if e['type'] == 'MONEY']
+        dates = [e['text'] for e in entities if e['type'] == 'DATE']
+        
+        # "M" of "March" is not a multiplier; a standalone "M" still is
+        assert [m['value'] for m in money] == [5.0, 2e6]
+        assert dates == ['March 3, 2024']
+        print("✅ Adjacent money and date entities both extracted")
 
 def run_integration_tests():
-    """Run all integration tests and provide summary"""
+    """Run all integration tests through pytest and report the outcome
+    
+    With pytest-xdist installed the tests are spread over worker processes
+    (``-n auto``); without it they run sequentially in this process.
+    """
     
     print("🧪 NITS Document Processing Integration Tests")
     print("=" * 60)
     
-    # Check if Flask service is available
-    try:
-        response = requests.get("http://localhost:5000/health", timeout=5)
-        if response.status_code != 200:
-            print("❌ Flask service not healthy - starting tests anyway")
-    except:
-        print("⚠️  Flask service not available - some tests may fail")
-    
-    # Run tests
-    test_instance = TestDocumentProcessing()
-    test_instance.setup_class()
-    
-    tests = [
-        ('Flask Health Check', test_instance.test_flask_service_health),
-        ('PDF Extraction', test_instance.test_pdf_extraction),
-        ('SEC Form 4 XML Parsing', test_instance.test_sec_form4_xml),
-        ('File Integrity Validation', test_instance.test_file_integrity_validation),
-        ('Binary Signature Validation', test_instance.test_binary_signature_validation),
-        ('Error Handling', test_instance.test_error_handling),
-    ]
-    
-    passed = 0
-    total = len(tests)
-    
-    for test_name, test_func in tests:
-        try:
-            print(f"\n🔍 Running: {test_name}")
-            test_func()
-            passed += 1
-            print(f"✅ PASSED: {test_name}")
-        except Exception as e:
-            print(f"❌ FAILED: {test_name} - {str(e)}")
-    
-    test_instance.teardown_class()
+    args = ['-q', __file__]
+    if XDIST_AVAILABLE:
+        args[:0] = ['-n', 'auto']
+    else:
+        print("⚠️  pytest-xdist not installed - running tests sequentially")
     
-    print(f"\n📊 RESULTS: {passed}/{total} tests passed ({passed/total*100:.1f}%)")
+    exit_code = pytest.main(args)
     
-    if passed/total >= 0.95:
-        print("🎉 SUCCESS: 95%+ success rate achieved!")
+    if exit_code == pytest.ExitCode.OK:
+        print("🎉 SUCCESS: all integration tests passed!")
         return True
     else:
-        print("⚠️  WARNING: Success rate below 95%")
+        print(f"⚠️  WARNING: pytest exited with {exit_code!r}")
         return False
 
 if __name__ == '__main__':
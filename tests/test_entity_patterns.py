@@ -0,0 +1,49 @@
+"""
+Tests for the /extract_entities patterns in src/parsers/entity_patterns.py
+They need none of the ML service's dependencies, so they always run
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.parsers.entity_patterns import find_entities
+
+def by_type(entities, entity_type):
+    return [e for e in entities if e['type'] == entity_type]
+
+class TestMoney:
+    
+    def test_money_before_month_name(self):
+        """The "M" of "March" is not a multiplier; a standalone "M" still is"""
+        entities = find_entities('Paid $5 March 3, 2024 and $2 M later')
+        
+        assert [m['value'] for m in by_type(entities, 'MONEY')] == [5.0, 2e6]
+        assert [d['text'] for d in by_type(entities, 'DATE')] == ['March 3, 2024']
+    
+    @pytest.mark.parametrize('text, value', [
+        ('$1,250.50', 1250.5),
+        ('$3 million', 3e6),
+        ('$4 Billion', 4e9),
+        ('$7B', 7e9),
+        ('$8 Bonds', 8.0),
+    ])
+    def test_multipliers(self, text, value):
+        money, = by_type(find_entities(text), 'MONEY')
+        assert money['value'] == value
+
+class TestGrouping:
+    
+    def test_entities_grouped_by_type(self):
+        text = 'On January 5, 2024 a $10 fine under 17 CFR 240.10(b) was paid'
+        entities = find_entities(text)
+        
+        assert [e['type'] for e in entities] == ['MONEY', 'REGULATION', 'DATE']
+        assert all(text[e['position']:].startswith(e['text']) for e in entities)
+    
+    def test_no_entities(self):
+        assert find_entities('Nothing to see here') == []
@@ -0,0 +1,63 @@
+"""
+Tests for production_monitor.ProductionMonitor metric snapshots
+Snapshots are appended to an NDJSON file, one JSON object per line
+"""
+
+import json
+import sys
+import threading
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from production_monitor import ProductionMonitor
+
+def read_lines(path: Path):
+    return [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+
+class TestMetricsFile:
+    
+    def test_save_every_appends_snapshots(self, tmp_path):
+        metrics_file = tmp_path / "metrics.jsonl"
+        monitor = ProductionMonitor(metrics_file=str(metrics_file), save_every=2)
+        
+        for i in range(5):
+            monitor.record_processing(f"doc_{i}.txt", violations=1, processing_time=0.5, success=i != 3)
+        
+        snapshots = read_lines(metrics_file)
+        assert [s['documents_processed'] for s in snapshots] == [2, 4]
+        assert snapshots[-1]['errors_count'] == 1
+        assert snapshots[-1]['violations_found'] == 4
+        assert all('saved_at' in s for s in snapshots)
+    
+    def test_save_every_zero_never_writes(self, tmp_path):
+        metrics_file = tmp_path / "metrics.jsonl"
+        monitor = ProductionMonitor(metrics_file=str(metrics_file), save_every=0)
+        
+        for i in range(10):
+            monitor.record_processing(f"doc_{i}.txt", violations=0, processing_time=0.1, success=True)
+        
+        assert not metrics_file.exists()
+        
+        monitor.save_metrics()
+        assert [s['documents_processed'] for s in read_lines(metrics_file)] == [10]
+    
+    def test_concurrent_saves_write_whole_lines(self, tmp_path):
+        metrics_file = tmp_path / "metrics.jsonl"
+        monitor = ProductionMonitor(metrics_file=str(metrics_file), save_every=0)
+        monitor.record_processing("doc.txt", violations=2, processing_time=0.2, success=True)
+        
+        def save_many():
+            for _ in range(50):
+                monitor.save_metrics()
+        
+        threads = [threading.Thread(target=save_many) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        snapshots = read_lines(metrics_file)
+        assert len(snapshots) == 400
+        assert all(s['documents_processed'] == 1 for s in snapshots)
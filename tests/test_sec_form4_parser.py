@@ -0,0 +1,172 @@
+"""
+Tests for SECForm4Parser fetching
+Requests go to a local HTTP server, so nothing reaches sec.gov
+"""
+
+import asyncio
+import sys
+import threading
+from collections import Counter, OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.parsers import sec_form4_parser
+from src.parsers.sec_form4_parser import SECForm4Parser
+
+FORM4_XML = b'''<?xml version="1.0"?>
+<ownershipDocument>
+    <schemaVersion>X0306</schemaVersion>
+    <issuer>
+        <issuerCik>0001318605</issuerCik>
+        <issuerName>TESLA INC</issuerName>
+        <issuerTradingSymbol>TSLA</issuerTradingSymbol>
+    </issuer>
+    <reportingOwner>
+        <reportingOwnerId>
+            <rptOwnerCik>0001494730</rptOwnerCik>
+            <rptOwnerName>MUSK ELON</rptOwnerName>
+        </reportingOwnerId>
+    </reportingOwner>
+</ownershipDocument>'''
+
+ETAG = '"v1"'
+
+class Form4Handler(BaseHTTPRequestHandler):
+    """
+    /<name>.xml          200 with an ETag, 304 once the client sends it back
+    /drop-<n>-<name>.xml drops the connection for the first n requests
+    /missing.xml         404
+    """
+    protocol_version = 'HTTP/1.1'
+    
+    def do_GET(self):
+        self.server.hits[self.path] += 1
+        name = self.path.lstrip('/')
+        
+        if name.startswith('drop-'):
+            drops = int(name.split('-')[1])
+            if self.server.hits[self.path] <= drops:
+                self.close_connection = True
+                return
+        
+        if name == 'missing.xml':
+            self._reply(404)
+        elif self.headers.get('If-None-Match') == ETAG:
+            self._reply(304)
+        else:
+            self._reply(200, FORM4_XML)
+    
+    def _reply(self, status: int, body: bytes = b''):
+        self.send_response(status)
+        self.send_header('ETag', ETAG)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture(scope="module")
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Form4Handler)
+    httpd.hits = Counter()
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+@pytest.fixture
+def base_url(server):
+    server.hits.clear()
+    return f'http://127.0.0.1:{server.server_port}/'
+
+@pytest.fixture(autouse=True)
+def fresh_parser_state(monkeypatch):
+    """Empty conditional cache and near-instant retry backoff for every test"""
+    monkeypatch.setattr(SECForm4Parser, '_conditional_cache', OrderedDict())
+    monkeypatch.setattr(SECForm4Parser, 'RETRY_BACKOFF', 0.01)
+
+@pytest.fixture(params=['aiohttp', 'threads'])
+def backend(request, monkeypatch):
+    """Run fetch_and_parse_many with each of its two backends"""
+    if request.param == 'aiohttp':
+        pytest.importorskip('aiohttp')
+    else:
+        monkeypatch.setattr(sec_form4_parser, 'AIOHTTP_AVAILABLE', False)
+    return request.param
+
+def fetch_many(urls):
+    return asyncio.run(SECForm4Parser().fetch_and_parse_many(urls))
+
+class TestConditionalFetch:
+    
+    def test_not_modified_hits_do_not_share_results(self, base_url, server):
+        parser = SECForm4Parser()
+        url = base_url + 'form4.xml'
+        
+        first = parser.fetch_and_parse(url)
+        first['issuer']['name'] = 'CHANGED'
+        first['transactions'].append('junk')
+        
+        second = parser.fetch_and_parse(url)
+        assert server.hits['/form4.xml'] == 2  # The second fetch was a 304
+        assert second['issuer']['name'] == 'TESLA INC'
+        assert second['transactions'] == []
+        
+        second['issuer']['name'] = 'CHANGED AGAIN'
+        assert parser.fetch_and_parse(url)['issuer']['name'] == 'TESLA INC'
+    
+    def test_not_modified_hit_gets_fresh_parsed_at(self, base_url):
+        parser = SECForm4Parser()
+        url = base_url + 'form4.xml'
+        
+        first = parser.fetch_and_parse(url)
+        first['parsed_at'] = 'stale'
+        assert parser.fetch_and_parse(url)['parsed_at'] != 'stale'
+    
+    def test_not_modified_hits_do_not_share_results_async(self, base_url, backend):
+        url = base_url + 'form4.xml'
+        
+        first, = fetch_many([url])
+        first['issuer']['name'] = 'CHANGED'
+        
+        second, third = fetch_many([url, url])
+        assert second['issuer']['name'] == third['issuer']['name'] == 'TESLA INC'
+        assert second is not third
+
+class TestFetchMany:
+    
+    def test_results_in_url_order(self, base_url, backend):
+        urls = [base_url + f'form4-{i}.xml' for i in range(3)] + [base_url + 'missing.xml']
+        results = fetch_many(urls)
+        
+        assert [r['issuer']['cik'] for r in results[:3]] == ['0001318605'] * 3
+        assert isinstance(results[3], Exception)
+    
+    def test_dropped_connections_are_retried(self, base_url, server, backend):
+        url = base_url + f'drop-2-{backend}.xml'
+        result, = fetch_many([url])
+        
+        assert result['issuer']['name'] == 'TESLA INC'
+        assert server.hits[f'/drop-2-{backend}.xml'] == 3
+    
+    def test_connection_error_after_last_retry(self, base_url, server, backend):
+        if backend == 'aiohttp':
+            import aiohttp
+            expected = aiohttp.ClientConnectionError
+        else:
+            import requests
+            expected = requests.exceptions.ConnectionError
+        
+        path = f'/drop-100-{backend}.xml'
+        result, = fetch_many([base_url + path.lstrip('/')])
+        
+        assert isinstance(result, expected)
+        # aiohttp may also retry a dropped keep-alive connection by itself
+        assert server.hits[path] >= SECForm4Parser.MAX_RETRIES + 1
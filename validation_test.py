@@ -6,8 +6,8 @@ Tests all critical fixes without requiring Flask service to be running
 
 import os
 import sys
-import tempfile
 import hashlib
+from io import BytesIO
 from pathlib import Path
 
 def test_sec_form4_parser():
@@ -66,20 +66,13 @@ def test_excel_processor():
             'xls_signature': b'\xD0\xCF\x11\xE0\xA1\xB1\x1A\xE1' + b'\x00' * 100  # OLE signature
         }
         
-        # Create temporary files for testing
+        # Detect straight from memory, no temporary files needed
         for format_type, data in test_data.items():
             ext = format_type.split('_')[0]
             
-            with tempfile.NamedTemporaryFile(delete=False, suffix=f'.{ext}') as tmp:
-                tmp.write(data)
-                tmp_path = tmp.name
-            
-            try:
-                detected_format = ExcelProcessor.detect_excel_format(tmp_path)
-                assert detected_format == ext
-                print(f"✅ {ext.upper()} format detection working")
-            finally:
-                os.unlink(tmp_path)
+            detected_format = ExcelProcessor.detect_excel_format(BytesIO(data))
+            assert detected_format == ext
+            print(f"✅ {ext.upper()} format detection working")
         
         print("✅ Excel processor format detection working correctly")
         return True